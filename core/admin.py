@@ -1,15 +1,56 @@
 # myproject/myapp/admin.py
 
+import hashlib
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, CharField, DecimalField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Concat
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone
 
 from .models import Stock, Holdings, Alarm, SavingPlan, Recommendation, DecicionLog, Category, Page, gmailShareConfig
+from .libs.cache_lib import bump_cache_version, get_cache_version
+from .signals import BOOKMARKS_CACHE, PORTFOLIO_STATS_CACHE
+
+
+def _is_changelist(request):
+    """True, wenn die Anfrage die Listenansicht eines ModelAdmins betrifft."""
+    match = getattr(request, 'resolver_match', None)
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
+def _stock_choice_queryset():
+    """Aktien-Auswahl für Formulare, reduziert auf die Felder, die Stock.__str__ benötigt."""
+    return Stock.objects.only('isin', 'symbol', 'name', 'currency').order_by('symbol')
+
+
+def _stock_label():
+    """Anzeigetext 'Name(ISIN)' der verknüpften Aktie, direkt in der Datenbank zusammengesetzt."""
+    return Concat('stock__name', Value('('), 'stock__isin', Value(')'), output_field=CharField())
+
+
+def _update_selected(model_admin, queryset, batch_size=1000, **values):
+    """
+    Aktualisiert die ausgewählten Objekte über ihre Primärschlüssel, ohne die Joins
+    der Listenansicht mitzuschleppen. Große Auswahlen werden in Blöcken verarbeitet.
+    """
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    manager = model_admin.model._default_manager
+    updated = 0
+    for start in range(0, len(ids), batch_size):
+        updated += manager.filter(pk__in=ids[start:start + batch_size]).update(**values)
+    return updated
 
 
 @admin.register(Stock)
 class StockAdmin(admin.ModelAdmin):
     list_display = ['isin', 'symbol', 'name', 'currency', 'exchange']
-    list_filter = ['currency', 'exchange']
-    search_fields = ['isin', 'wkn', 'symbol', 'name']
+    search_fields = ['^isin', '^wkn', '^symbol', 'name']  # Präfixsuche für Kennungen (indexfähig)
+    show_full_result_count = False  # Spart das zusätzliche COUNT(*) bei aktiven Filtern
     readonly_fields = ['created_at', 'updated_at']
     fieldsets = (
         ('Grunddaten', {
@@ -24,14 +65,24 @@ class StockAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        match = getattr(request, 'resolver_match', None)
+        if match and match.url_name == 'autocomplete':
+            # Die Autocomplete-Antwort braucht nur PK und Stock.__str__ (Name + Symbol)
+            queryset = queryset.only('isin', 'symbol', 'name')
+        return queryset, may_have_duplicates
+
 
 @admin.register(Holdings)
 class HoldingsAdmin(admin.ModelAdmin):
     list_display = ['stock_id', 'quantity', 'average_purchase_price', 'total_investment_display']
-    list_filter = ['stock_id', 'category']
+    list_filter = ['category']
     search_fields = ['isin', 'stock__symbol', 'stock__name']
     readonly_fields = ['created_at', 'updated_at', 'total_investment_display']
     autocomplete_fields = ['stock']  # Für bessere UX bei vielen Aktien
+    list_select_related = ('stock',)  # Verhindert N+1-Abfragen in der Listenansicht
+    show_full_result_count = False
     
     fieldsets = (
         ('Position', {
@@ -50,31 +101,50 @@ class HoldingsAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('stock').annotate(
+            # Gesamtinvestition direkt in der Datenbank berechnen (sortierbar)
+            _total_investment=ExpressionWrapper(
+                F('quantity') * F('average_purchase_price'),
+                output_field=DecimalField(max_digits=24, decimal_places=10),
+            ),
+            _stock_label=_stock_label(),
+        )
+        if _is_changelist(request):
+            # Nur die Spalten laden, die in der Listenansicht angezeigt werden
+            queryset = queryset.only(
+                'id', 'quantity', 'average_purchase_price', 'category', 'stock',
+                'stock__symbol', 'stock__name', 'stock__isin', 'stock__currency',
+            )
+        return queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'stock':
+            kwargs['queryset'] = _stock_choice_queryset()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    @admin.display(description='Symbol', ordering='stock__symbol')
     def stock_symbol(self, obj):
         return obj.stock.symbol
-    
-    
-    stock_symbol.short_description = 'Symbol'
-    stock_symbol.admin_order_field = 'stock__symbol'
-    
+
+    @admin.display(description='Symbol', ordering='_stock_label')
     def stock_id(self, obj):
-        return f"{obj.stock.name}({obj.stock.isin})" 
-    stock_id.short_description = 'Symbol'
-    stock_id.admin_order_field = 'stock__name'
+        return obj._stock_label
 
-    
+    @admin.display(description='Gesamtinvestition', ordering='_total_investment')
     def total_investment_display(self, obj):
-        total = obj.total_investment
+        # Annotierter Wert aus get_queryset, Property als Fallback (z.B. im Hinzufügen-Formular)
+        total = obj._total_investment if hasattr(obj, '_total_investment') else obj.total_investment
         if total:
             return f"{total:.2f} {obj.stock.currency}"
         return "-"
-    total_investment_display.short_description = 'Gesamtinvestition'
 
 @admin.register(SavingPlan)
 class SavingPlanAdmin(admin.ModelAdmin):
     list_display = ['stock_symbol', 'is_active']
-    list_filter = ['stock__symbol', 'stock__name', 'is_active']
-    search_fields = ['stock__symbol']
+    list_select_related = ('stock',)
+    list_filter = ['is_active']  # Aktien über die Suche eingrenzen statt über DISTINCT-Filter
+    search_fields = ['stock__symbol', 'stock__name']
     readonly_fields = ['created_at', 'updated_at']
     autocomplete_fields = ['stock']
     
@@ -88,18 +158,19 @@ class SavingPlanAdmin(admin.ModelAdmin):
         })
     )
 
+    @admin.display(description='Symbol', ordering='stock__symbol')
     def stock_symbol(self, obj):
         return obj.stock.symbol
-    stock_symbol.short_description = 'Symbol'
-    stock_symbol.admin_order_field = 'stock__symbol'
 
 @admin.register(Alarm)
 class AlarmAdmin(admin.ModelAdmin):
     list_display = ['stock_symbol', 'threshold_value_low', 'threshold_value_high', 'is_active']
-    list_filter = ['stock__symbol', 'stock__name', 'is_active']
-    search_fields = ['stock__symbol']
+    list_filter = ['is_active']  # Aktien über die Suche eingrenzen statt über DISTINCT-Filter
+    search_fields = ['stock__symbol', 'stock__name']
     readonly_fields = ['created_at', 'updated_at']
     autocomplete_fields = ['stock']
+    list_select_related = ('stock',)
+    show_full_result_count = False
     
     fieldsets = (
         ('Alarm-Einstellungen', {
@@ -111,21 +182,36 @@ class AlarmAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('stock')
+        if _is_changelist(request):
+            queryset = queryset.only(
+                'id', 'threshold_value_low', 'threshold_value_high', 'is_active', 'stock',
+                'stock__symbol',
+            )
+        return queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'stock':
+            kwargs['queryset'] = _stock_choice_queryset()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    @admin.display(description='Symbol', ordering='stock__symbol')
     def stock_symbol(self, obj):
         return obj.stock.symbol
-    stock_symbol.short_description = 'Symbol'
-    stock_symbol.admin_order_field = 'stock__symbol'
 
     # Aktionen für mehrere Alarme gleichzeitig
     actions = ['activate_alarms', 'deactivate_alarms']
 
     def activate_alarms(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = _update_selected(self, queryset, is_active=True)
+        bump_cache_version(PORTFOLIO_STATS_CACHE)  # update() löst keine post_save-Signale aus
         self.message_user(request, f'{updated} Alarme aktiviert.')
     activate_alarms.short_description = "Ausgewählte Alarme aktivieren"
 
     def deactivate_alarms(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = _update_selected(self, queryset, is_active=False)
+        bump_cache_version(PORTFOLIO_STATS_CACHE)
         self.message_user(request, f'{updated} Alarme deaktiviert.')
     deactivate_alarms.short_description = "Ausgewählte Alarme deaktivieren"
 
@@ -133,11 +219,13 @@ class AlarmAdmin(admin.ModelAdmin):
 
 @admin.register(Recommendation)
 class RecommendationAdmin(admin.ModelAdmin):
-    list_display = ['stock_id', 'action', 'source', 'target_price', 'confidence', 'publication_date', 'is_valid']
+    list_display = ['stock_id', 'action', 'source', 'target_price', 'confidence', 'publication_date', 'is_valid', 'is_expired_display']
     list_filter = ['action', 'confidence', 'strategy']
     search_fields = ['stock__symbol', 'stock__name', 'source']
     readonly_fields = ['created_at', 'updated_at']
     autocomplete_fields = ['stock']
+    list_select_related = ('stock',)
+    show_full_result_count = False
     date_hierarchy = 'publication_date'
     
     fieldsets = (
@@ -148,7 +236,7 @@ class RecommendationAdmin(admin.ModelAdmin):
             'fields': ('source', 'publication_date')
         }),
         ('Details', {
-            'fields': ('reasoning', 'url', 'is_valid')
+            'fields': ('reasoning', 'url', 'is_valid', 'expiry_date')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -156,33 +244,55 @@ class RecommendationAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('stock').annotate(
+            _stock_label=_stock_label(),
+            # Ablauf in SQL bestimmen, damit die Spalte sortierbar ist
+            _is_expired=Case(
+                When(expiry_date__lt=timezone.localdate(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        if _is_changelist(request):
+            queryset = queryset.only(
+                'id', 'action', 'source', 'target_price', 'confidence', 'publication_date', 'is_valid', 'stock',
+                'stock__name', 'stock__isin',
+            )
+        return queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'stock':
+            kwargs['queryset'] = _stock_choice_queryset()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    @admin.display(description='Symbol', ordering='_stock_label')
     def stock_id(self, obj):
-        return f"{obj.stock.name}({obj.stock.isin})" 
-    stock_id.short_description = 'Symbol'
-    stock_id.admin_order_field = 'stock__name'
+        return obj._stock_label
 
+    @admin.display(description='Abgelaufen', ordering='_is_expired')
     def is_expired_display(self, obj):
-        if obj.is_expired:
+        if obj._is_expired:
             return "Ja ⚠️"
         return "Nein ✅"
-    is_expired_display.short_description = 'Abgelaufen'
 
     # Aktionen für Empfehlungen
     actions = ['mark_as_invalid', 'mark_as_valid']
 
     def mark_as_invalid(self, request, queryset):
-        updated = queryset.update(is_valid=False)
+        updated = _update_selected(self, queryset, is_valid=False)
         self.message_user(request, f'{updated} Empfehlungen als ungültig markiert.')
     mark_as_invalid.short_description = "Als ungültig markieren"
 
     def mark_as_valid(self, request, queryset):
-        updated = queryset.update(is_valid=True)
+        updated = _update_selected(self, queryset, is_valid=True)
         self.message_user(request, f'{updated} Empfehlungen als gültig markiert.')
     mark_as_valid.short_description = "Als gültig markieren"
 
 @admin.register(DecicionLog)
 class DecicionLogAdmin(admin.ModelAdmin):
     list_display = ['stock_id', 'action', 'source', 'execution_price', 'next_step_price', 'publication_date']
+    list_select_related = ('stock',)
     list_filter = ['action']
     search_fields = ['stock__symbol', 'stock__name', 'source']
     readonly_fields = ['created_at', 'updated_at']
@@ -202,25 +312,120 @@ class DecicionLogAdmin(admin.ModelAdmin):
         })
     )
 
+    @admin.display(description='Symbol', ordering='stock__name')
     def stock_id(self, obj):
         return f"{obj.stock.name}({obj.stock.isin})" 
-    stock_id.short_description = 'Symbol'
-    stock_id.admin_order_field = 'stock__name'
+
+class CachedChangelistMixin:
+    """
+    Cacht die gerenderte Listenansicht pro Sitzung und URL für kurze Zeit.
+    Eignet sich für nahezu statische Inhalte; Änderungen invalidieren den Cache über
+    eine Versionsnummer (siehe core.signals).
+    Die Seite enthält das CSRF-Token des Aktionsformulars, deshalb hängt der Schlüssel
+    an Sitzung und CSRF-Cookie; ohne CSRF-Cookie wird nicht gecacht.
+    """
+    changelist_cache_name = None
+    changelist_cache_timeout = 60
+
+    def changelist_view(self, request, extra_context=None):
+        if (
+            request.method != 'GET'
+            or extra_context
+            or not self.has_view_or_change_permission(request)
+            or get_messages(request)  # Ausstehende Meldungen müssen angezeigt werden
+        ):
+            return super().changelist_view(request, extra_context)
+
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+        if not csrf_cookie or not session_key:
+            # Erster Aufruf: das Token der Seite gehört zu einem erst noch zu setzenden Cookie
+            return super().changelist_view(request, extra_context)
+
+        # Gehasht, damit Sitzungsschlüssel und CSRF-Secret nicht im Klartext im Cache-Schlüssel stehen
+        client_hash = hashlib.sha256(f"{session_key}:{csrf_cookie}".encode()).hexdigest()
+        cache_key = "admin_changelist:{}:{}:{}:{}:{}".format(
+            self.opts.label_lower,
+            get_cache_version(self.changelist_cache_name),
+            request.user.pk,
+            client_hash,
+            request.get_full_path(),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            content, headers = cached
+            get_token(request)  # CSRF-Cookie wie bei einer gerenderten Seite erneuern
+            return HttpResponse(content, headers=headers)
+
+        response = super().changelist_view(request, extra_context)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.render()
+            # Inhalt samt Headern (Content-Type mit Charset, Vary usw.) cachen
+            cache.set(cache_key, (response.content, dict(response.items())), self.changelist_cache_timeout)
+        return response
+
+
+class PriorityFilter(admin.SimpleListFilter):
+    """
+    Filter nach Prioritätsbereichen mit festen Optionen, damit die Listenansicht
+    kein SELECT DISTINCT über alle Kategorien ausführen muss.
+    """
+    title = 'Priorität'
+    parameter_name = 'priority_range'
+
+    RANGES = {
+        'top': ('≤ 0', {'priority__lte': 0}),
+        'high': ('1–5', {'priority__gte': 1, 'priority__lte': 5}),
+        'mid': ('6–10', {'priority__gte': 6, 'priority__lte': 10}),
+        'low': ('> 10', {'priority__gt': 10}),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _) in self.RANGES.items()]
+
+    def queryset(self, request, queryset):
+        selected = self.RANGES.get(self.value())
+        if selected is None:
+            return queryset
+        return queryset.filter(**selected[1])
+
+
+def _make_set_priority_action(value):
+    def set_priority(modeladmin, request, queryset):
+        updated = _update_selected(modeladmin, queryset, priority=value)
+        # update() löst keine post_save-Signale aus, daher den Cache selbst invalidieren
+        bump_cache_version(BOOKMARKS_CACHE)
+        modeladmin.message_user(request, f'{updated} Kategorien auf Priorität {value} gesetzt.')
+    return set_priority
+
 
 # Registriere das Category Model
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(CachedChangelistMixin, admin.ModelAdmin):
+    changelist_cache_name = BOOKMARKS_CACHE
     list_display = ('name', 'priority') # Zeigt diese Felder in der Listenansicht an
     search_fields = ('name',) # Erlaubt die Suche nach dem Namen
-    list_editable = ('priority',) # Erlaubt die direkte Bearbeitung der Priorität in der Liste
-    list_filter = ('priority',) # Filter nach Priorität
+    list_filter = (PriorityFilter,) # Filter nach Prioritätsbereich (feste Optionen)
+
+    # Priorität per Aktion statt list_editable setzen (keine Formulare pro Zeile)
+    PRIORITY_ACTION_VALUES = range(0, 6)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        for value in self.PRIORITY_ACTION_VALUES:
+            name = f'set_priority_{value}'
+            actions[name] = (_make_set_priority_action(value), name, f"Priorität auf {value} setzen")
+        return actions
 
 # Registriere das Page Model
 @admin.register(Page)
-class PageAdmin(admin.ModelAdmin):
+class PageAdmin(CachedChangelistMixin, admin.ModelAdmin):
+    changelist_cache_name = BOOKMARKS_CACHE
     list_display = ('title', 'url', 'category', 'icon') # Zeigt diese Felder an
     search_fields = ('title', 'description', 'url') # Erlaubt die Suche
     list_filter = ('category',) # Filter nach Kategorie
+    ordering = ('title',) # Page hat keine Meta.ordering, damit vorab geladene pages-Sets nicht neu sortiert werden
+    show_full_result_count = False
     # Füge eine Inline-Bearbeitung für Pages innerhalb der Category-Ansicht hinzu
     # Dadurch kannst du Pages direkt beim Bearbeiten einer Kategorie hinzufügen/ändern
     # Inlines werden oft in der CategoryAdmin-Klasse verwendet, aber zur Vereinfachung hier separat gezeigt.
@@ -0,0 +1,46 @@
+# myproject/myapp/forms.py
+
+from django import forms
+
+
+class EmailForm(forms.Form):
+    """Formularfelder von get_emails.html; CharField entfernt führende/folgende Leerzeichen."""
+    gmail_user = forms.CharField()
+    gmail_password = forms.CharField(strip=False)
+    source_folder = forms.CharField()
+    target_folder = forms.CharField()
+    save_path = forms.CharField()
+
+
+class ChannelForm(forms.Form):
+    """Formularfelder von get_channels.html."""
+    tenant_id = forms.CharField()
+    client_id = forms.CharField()
+    client_secret = forms.CharField(required=False, strip=False) # Pflicht, wenn use_device_code=False
+    team = forms.CharField() # Name oder GUID
+    channel = forms.CharField() # Name oder GUID
+    save_path = forms.CharField()
+    use_device_code = forms.BooleanField(required=False) # Checkbox: fehlt im POST -> False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("use_device_code") and not cleaned_data.get("client_secret"):
+            raise forms.ValidationError("Wenn Device Code deaktiviert ist, muss ein Client Secret angegeben werden.")
+        cleaned_data["client_secret"] = cleaned_data.get("client_secret") or None
+        return cleaned_data
+
+    def first_error(self):
+        """Erste Fehlermeldung für die Anzeige: formularweite Fehler vor Feldfehlern."""
+        non_field = self.non_field_errors()
+        if non_field:
+            return non_field[0]
+        for name, errors in self.errors.items():
+            return f"{name}: {errors[0]}"
+        return "Ungültige Eingabe."
+
+    def missing_fields(self):
+        """Namen der nicht ausgefüllten Pflichtfelder (nur nach is_valid() sinnvoll)."""
+        return [
+            name for name, errors in self.errors.as_data().items()
+            if any(error.code == "required" for error in errors)
+        ]
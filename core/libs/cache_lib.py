@@ -0,0 +1,23 @@
+# myproject/myapp/cache_lib.py
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = "cache_version"
+
+
+def get_cache_version(name):
+    """Liefert die aktuelle Version eines Cache-Bereichs (0, wenn noch nie invalidiert)."""
+    return cache.get(f"{VERSION_KEY_PREFIX}:{name}", 0)
+
+
+def bump_cache_version(name):
+    """
+    Erhöht die Version eines Cache-Bereichs. Alle Einträge, deren Schlüssel die alte
+    Version enthalten, werden dadurch ungültig und laufen über ihr Timeout aus.
+    """
+    key = f"{VERSION_KEY_PREFIX}:{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Schlüssel existiert noch nicht (oder wurde verdrängt)
+        cache.set(key, 1, None)
@@ -0,0 +1,206 @@
+# myproject/myapp/gmail_async_lib.py
+
+"""
+AsyncGmailLib — asynchrone Variante der GmailLib auf Basis von aioimaplib.
+
+aioimaplib führt FETCH-Befehle einer Verbindung nacheinander aus. fetch_messages() setzt
+deshalb wie GmailLib.bulk_fetch einen FETCH pro Block (Sequence-Set) ab; parallel wird erst
+über mehrere Verbindungen: fetch_messages_concurrently() verteilt die IDs auf `connections`
+gleichzeitig angemeldete Verbindungen.
+
+Verwendung:
+    async with AsyncGmailLib(user, password) as gmail:
+        msg_ids = await gmail.get_message_ids_in_folder("INBOX")
+        async for msg_id, raw_email, email_message in gmail.fetch_messages(msg_ids):
+            ...
+
+Für synchronen Code (z.B. Django-Views) steht fetch_messages_concurrently() zur Verfügung.
+aioimaplib ist optional (siehe requirements.txt); die synchrone GmailLib bleibt davon unabhängig.
+"""
+
+import asyncio
+import email
+import logging
+
+from .gmail_lib import GMAIL_LIB_EXCEPTION, ErrorType, _FETCH_ID_RE, _FETCH_PEEK_PARTS, _encode_folder_name, _to_sequence_set
+
+logger = logging.getLogger(__name__)
+
+AIOIMAPLIB_AVAILABLE = True
+try:
+    import aioimaplib  # type: ignore
+except Exception:  # pragma: no cover
+    AIOIMAPLIB_AVAILABLE = False
+
+# Gmail erlaubt höchstens 15 gleichzeitige IMAP-Verbindungen pro Konto
+DEFAULT_CONNECTIONS = 4
+
+
+def _error_text(response, default):
+    """Liefert die erste Zeile einer aioimaplib-Antwort als Text für Fehlermeldungen."""
+    if response is not None and response.lines:
+        line = response.lines[0]
+        return line.decode(errors="ignore") if isinstance(line, (bytes, bytearray)) else str(line)
+    return default
+
+
+class AsyncGmailLib:
+    def __init__(self, user, password):
+        """
+        Initialisiert die asynchrone Gmail-Bibliothek.
+        Verbindet sich noch nicht mit dem IMAP-Server.
+        """
+        self.user = user
+        self.password = password
+        self.mail = None
+        self._selected_folder = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            await self.logout()
+        except GMAIL_LIB_EXCEPTION:
+            if exc_type is None:
+                raise
+        return False
+
+    async def login(self):
+        """Stellt die Verbindung zu Gmail her und meldet sich an.
+        Wirft GMAIL_LIB_EXCEPTION bei Fehlschlag."""
+        if not AIOIMAPLIB_AVAILABLE:
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message="aioimaplib ist nicht installiert. pip install aioimaplib")
+        if self.mail is not None:
+            return # Bereits angemeldet
+        try:
+            self._selected_folder = None
+            mail = aioimaplib.IMAP4_SSL(host="imap.gmail.com")
+            await mail.wait_hello_from_server()
+            response = await mail.login(self.user, self.password)
+        except Exception as e:
+            logger.error(f"Unerwarteter Fehler beim Login für {self.user}: {e}", exc_info=True)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Login-Fehler für {self.user}: {e}")
+        if response.result != "OK":
+            error_msg = _error_text(response, "Unbekannter Fehler beim Login.")
+            logger.error(f"IMAP-Fehler beim Login für {self.user}: {error_msg}")
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.LOGIN_FAILED, message=f"Login fehlgeschlagen für {self.user}: Prüfe Benutzername/App-Passwort oder IMAP-Aktivierung. ({error_msg})")
+        self.mail = mail
+        logger.info(f"Erfolgreich bei {self.user} angemeldet (async).")
+
+    async def logout(self):
+        """Meldet sich vom IMAP-Server ab.
+        Wirft GMAIL_LIB_EXCEPTION bei Fehlschlag."""
+        if self.mail is None:
+            return
+        mail, self.mail, self._selected_folder = self.mail, None, None
+        try:
+            await mail.logout()
+            logger.info("Erfolgreich von Gmail abgemeldet (async).")
+        except Exception as e:
+            logger.error(f"Fehler beim Logout: {e}", exc_info=True)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Fehler beim Logout: {e}")
+
+    async def _ensure_selected(self, folder_name):
+        """Wählt einen Ordner nur aus, wenn er nicht bereits ausgewählt ist."""
+        if self._selected_folder == folder_name:
+            return
+        self._selected_folder = None
+        response = await self.mail.select(f'"{_encode_folder_name(folder_name)}"')
+        if response.result != "OK":
+            error_msg = _error_text(response, "Unbekannte Fehlermeldung beim Ordnerauswahl.")
+            logger.error(f"Fehler beim Auswählen des Ordners '{folder_name}': {error_msg}")
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FOLDER_SELECT_FAILED, message=f"Fehler beim Auswählen des Ordners '{folder_name}': {error_msg}")
+        self._selected_folder = folder_name
+
+    async def get_message_ids_in_folder(self, folder_name):
+        """
+        Holt alle Nachrichten-IDs aus einem spezifischen Ordner und sortiert sie absteigend.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        await self.login()
+        await self._ensure_selected(folder_name)
+        try:
+            response = await self.mail.search("ALL")
+        except Exception as e:
+            self._selected_folder = None
+            logger.error(f"Unerwarteter Fehler beim Abrufen der Nachrichten-IDs aus '{folder_name}': {e}", exc_info=True)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Fehler beim Abrufen der Nachrichten-IDs: {e}")
+        if response.result != "OK":
+            error_msg = _error_text(response, "Unbekannte Fehlermeldung bei der E-Mail-Suche.")
+            logger.error(f"Fehler bei der Suche nach E-Mails im Ordner '{folder_name}': {error_msg}")
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.SEARCH_FAILED, message=f"Fehler bei der Suche nach E-Mails im Ordner '{folder_name}': {error_msg}")
+
+        message_ids = response.lines[0].split() if response.lines else []
+        message_ids.sort(key=int, reverse=True)
+        return message_ids
+
+    async def fetch_messages(self, msg_ids, parts=_FETCH_PEEK_PARTS, batch_size=100):
+        """
+        Holt mehrere E-Mails mit einem FETCH pro Block von batch_size IDs (wie GmailLib.bulk_fetch).
+        Liefert (msg_id, raw_email, email_message)-Tupel in der Reihenfolge von msg_ids (async generator).
+        Der Ordner muss bereits ausgewählt sein (z.B. durch get_message_ids_in_folder).
+        Standardmäßig wird wie bei GmailLib BODY.PEEK[] abgerufen, das \\Seen-Flag bleibt unverändert.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        msg_ids = list(msg_ids)
+        for start in range(0, len(msg_ids), batch_size):
+            batch = msg_ids[start:start + batch_size]
+            sequence_set = _to_sequence_set(batch)
+            try:
+                response = await self.mail.fetch(sequence_set, parts)
+            except Exception as e:
+                self._selected_folder = None
+                logger.error(f"Unerwarteter Fehler beim Abrufen der E-Mails {sequence_set}: {e}", exc_info=True)
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=f"Fehler beim Abrufen der E-Mails {sequence_set}: {e}")
+            if response.result != "OK":
+                error_msg = _error_text(response, "Unbekannter Fehler beim Abrufen.")
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=f"Konnte E-Mails {sequence_set} nicht abrufen: {error_msg}")
+
+            # aioimaplib liefert je E-Mail die Kopfzeile (b'42 FETCH (BODY[] {1234}') gefolgt vom Inhalt als bytearray
+            raw_by_id = {}
+            header = None
+            for line in response.lines:
+                if isinstance(line, bytearray):
+                    match = _FETCH_ID_RE.match(header) if header else None
+                    if match:
+                        raw_by_id[int(match.group(1))] = bytes(line)
+                    header = None
+                else:
+                    header = line
+
+            for msg_id in batch:
+                raw_email = raw_by_id.get(int(msg_id))
+                if raw_email is None:
+                    logger.warning(f"E-Mail mit ID {msg_id.decode()} fehlt in der FETCH-Antwort und wird übersprungen.")
+                    continue
+                yield msg_id, raw_email, email.message_from_bytes(raw_email)
+
+
+def fetch_messages_concurrently(user, password, folder_name, msg_ids=None, connections=DEFAULT_CONNECTIONS):
+    """
+    Synchroner Einstieg: holt die E-Mails eines Ordners (oder nur msg_ids) über bis zu `connections`
+    gleichzeitig angemeldete Verbindungen, jede mit einem zusammenhängenden Teil der IDs.
+    Gibt eine Liste von (msg_id, raw_email, email_message)-Tupeln in der Reihenfolge von msg_ids zurück.
+    Darf nicht aus einem laufenden Event-Loop heraus aufgerufen werden.
+    """
+    async def _fetch_part(part):
+        async with AsyncGmailLib(user, password) as gmail:
+            await gmail._ensure_selected(folder_name)
+            return [item async for item in gmail.fetch_messages(part)]
+
+    async def _run():
+        ids = msg_ids
+        if ids is None:
+            async with AsyncGmailLib(user, password) as gmail:
+                ids = await gmail.get_message_ids_in_folder(folder_name)
+        ids = list(ids)
+        if not ids:
+            return []
+        part_size = -(-len(ids) // max(1, min(connections, len(ids)))) # aufgerundet
+        parts = [ids[start:start + part_size] for start in range(0, len(ids), part_size)]
+        results = await asyncio.gather(*(_fetch_part(part) for part in parts))
+        return [item for result in results for item in result]
+
+    return asyncio.run(_run())
@@ -5,10 +5,179 @@ import email
 from email.header import decode_header
 import os
 import logging
+import time
+import functools
+from collections import OrderedDict
+import binascii
 import re # Importiere das 're'-Modul für reguläre Ausdrücke
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Alles außer Buchstaben/Ziffern (inkl. Umlaute), Unterstrich, Leerzeichen, Punkt und Bindestrich
+_SANITIZE_RE = re.compile(r'[^\w .-]+')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
+# Ordnername innerhalb der letzten doppelten Anführungszeichen einer LIST-Zeile
+_FOLDER_LINE_RE = re.compile(rb'"([^"]*)"[^"]*$')
+
+
+# Base64-Abschnitt in Modified UTF-7 (RFC 3501 §5.1.3): '&' ... '-', mit ',' statt '/'
+_MUTF7_SEGMENT_RE = re.compile(r'&([A-Za-z0-9+,]*)-')
+
+
+def _decode_mutf7_segment(match):
+    encoded = match.group(1)
+    if not encoded:
+        return '&' # '&-' steht für ein einzelnes '&'
+    try:
+        return binascii.a2b_base64(encoded.replace(',', '/') + '=' * (-len(encoded) % 4)).decode('utf-16-be')
+    except (binascii.Error, UnicodeDecodeError):
+        return match.group(0) # Ungültige Sequenz unverändert lassen
+
+
+def _decode_folder_name(raw_name):
+    """
+    Dekodiert einen Ordnernamen (oder eine ganze LIST-Zeile) aus Modified UTF-7.
+    Reine ASCII-Namen ohne '&' (der Normalfall) werden direkt per ascii dekodiert.
+    """
+    if raw_name.isascii():
+        text = raw_name.decode('ascii')
+        if '&' not in text:
+            return text
+    else:
+        text = raw_name.decode('utf-8', errors='replace') # Kein gültiges Modified UTF-7, trotzdem nicht verwerfen
+    return _MUTF7_SEGMENT_RE.sub(_decode_mutf7_segment, text)
+
+
+def _encode_folder_name(folder_name):
+    """Kodiert einen Ordnernamen für IMAP-Befehle (SELECT, COPY) in Modified UTF-7."""
+    if folder_name.isascii() and '&' not in folder_name:
+        return folder_name
+    result = []
+    pending = []
+
+    def flush():
+        if pending:
+            encoded = binascii.b2a_base64(''.join(pending).encode('utf-16-be'), newline=False).decode('ascii')
+            result.append('&' + encoded.rstrip('=').replace('/', ',') + '-')
+            pending.clear()
+
+    for char in folder_name:
+        if 0x20 <= ord(char) <= 0x7e:
+            flush()
+            result.append('&-' if char == '&' else char)
+        else:
+            pending.append(char)
+    flush()
+    return ''.join(result)
+
+
+# Blockgröße und Dateipuffer für das Schreiben von E-Mails und Anhängen
+_WRITE_CHUNK_SIZE = 1 << 20
+_WRITE_BUFFER_SIZE = 1024 * 1024
+# Maximale Anzahl paralleler Schreibvorgänge in save_attachments
+_ATTACHMENT_WRITE_WORKERS = 4
+
+
+def _write_bytes(filepath, payload):
+    """Schreibt payload blockweise über eine memoryview, ohne Teilkopien der Daten anzulegen."""
+    mv = memoryview(payload)
+    with open(filepath, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        for i in range(0, len(mv), _WRITE_CHUNK_SIZE):
+            f.write(mv[i:i + _WRITE_CHUNK_SIZE])
+
+
+# Blockgröße (Zeichen des kodierten Inhalts) für das streamende Dekodieren von Anhängen
+_DECODE_CHUNK_SIZE = 64 * 1024
+_BASE64_WHITESPACE = b' \t\r\n'
+
+
+def _iter_base64_chunks(encoded):
+    """Dekodiert einen base64-Text blockweise; Reste werden bis zur nächsten 4er-Grenze mitgeführt."""
+    rest = b''
+    for i in range(0, len(encoded), _DECODE_CHUNK_SIZE):
+        buf = rest + encoded[i:i + _DECODE_CHUNK_SIZE].encode('ascii', 'ignore').translate(None, _BASE64_WHITESPACE)
+        cut = len(buf) - len(buf) % 4
+        rest = buf[cut:]
+        if cut:
+            yield binascii.a2b_base64(buf[:cut])
+    if rest:
+        # Unvollständiges Schlussquartett tolerant auffüllen, unbrauchbare Reste verwerfen
+        try:
+            yield binascii.a2b_base64(rest + b'=' * (-len(rest) % 4))
+        except binascii.Error:
+            logger.warning(f"Unvollständige base64-Daten am Ende eines Anhangs verworfen ({len(rest)} Zeichen).")
+
+
+def _payload_to_bytes(text):
+    """Wandelt kodierten Payload-Text wie email.message.Message.get_payload in bytes um."""
+    try:
+        return text.encode('ascii', 'surrogateescape')
+    except UnicodeError:
+        return text.encode('raw-unicode-escape')
+
+
+def _iter_qp_chunks(encoded):
+    """Dekodiert quoted-printable zeilenweise gebündelt, damit Soft-Line-Breaks nicht zerschnitten werden."""
+    lines = []
+    size = 0
+    for line in encoded.splitlines(keepends=True):
+        lines.append(line)
+        size += len(line)
+        if size >= _DECODE_CHUNK_SIZE:
+            yield binascii.a2b_qp(_payload_to_bytes(''.join(lines)))
+            lines, size = [], 0
+    if lines:
+        yield binascii.a2b_qp(_payload_to_bytes(''.join(lines)))
+
+
+def _write_part_payload(filepath, part):
+    """
+    Schreibt den Inhalt eines MIME-Teils in eine Datei. base64 und quoted-printable werden blockweise
+    dekodiert und sofort geschrieben, statt den kompletten Anhang vorher als bytes zu erzeugen.
+    Andere Transfer-Encodings laufen über get_payload(decode=True).
+    """
+    encoded = part.get_payload(decode=False)
+    cte = str(part.get('Content-Transfer-Encoding', '')).strip().lower()
+    if not isinstance(encoded, str) or cte not in ('base64', 'quoted-printable'):
+        _write_bytes(filepath, part.get_payload(decode=True))
+        return
+    chunks = _iter_base64_chunks(encoded) if cte == 'base64' else _iter_qp_chunks(encoded)
+    with open(filepath, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+# Nachrichten-ID am Anfang einer FETCH-Antwort, z.B. b'42 (RFC822 {1234}'
+_FETCH_ID_RE = re.compile(rb'^(\d+) ')
+
+# BODY.PEEK[] liefert dieselben Bytes wie RFC822, setzt aber nicht das \Seen-Flag
+_FETCH_PEEK_PARTS = "(BODY.PEEK[])"
+_FETCH_SEEN_PARTS = "(RFC822)"
+# Anzahl zwischengespeicherter E-Mails in _fetch_email_message (klein halten, Anhänge können groß sein)
+_MESSAGE_CACHE_SIZE = 8
+
+
+def _to_sequence_set(msg_ids):
+    """
+    Baut aus Nachrichten-IDs ein IMAP-Sequence-Set.
+    Zusammenhängende IDs werden zu Bereichen zusammengefasst, z.B. [1, 2, 3, 7] -> "1:3,7".
+    """
+    numbers = sorted({int(mid) for mid in msg_ids})
+    if not numbers:
+        return ""
+    ranges = []
+    start = prev = numbers[0]
+    for number in numbers[1:]:
+        if number == prev + 1:
+            prev = number
+            continue
+        ranges.append(f"{start}:{prev}" if start != prev else str(start))
+        start = prev = number
+    ranges.append(f"{start}:{prev}" if start != prev else str(start))
+    return ",".join(ranges)
+
 class ErrorType:
     """Definiert standardisierte Fehlertypen für GMAIL_LIB_EXCEPTION."""
     LOGIN_FAILED = "login_failed"
@@ -37,26 +206,102 @@ class GMAIL_LIB_EXCEPTION(Exception):
     def __str__(self):
         return f"GMAIL_LIB_EXCEPTION(Type: {self.type}, Message: {self.message})"
 
+# Wiederholungen beim automatischen Verbindungsaufbau (exponentielles Backoff: 1s, 2s, ...)
+_CONNECT_RETRIES = 3
+_CONNECT_BACKOFF_BASE = 1.0
+
+
+def ensure_connected(method):
+    """
+    Decorator für GmailLib-Methoden, die eine angemeldete IMAP-Verbindung benötigen.
+    Baut die Verbindung bei Bedarf auf und wiederholt Verbindungsfehler mit exponentiellem Backoff.
+    Anmeldefehler (LOGIN_FAILED) werden nicht wiederholt.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.is_connected():
+            for attempt in range(_CONNECT_RETRIES):
+                try:
+                    self._login()
+                    break
+                except GMAIL_LIB_EXCEPTION as e:
+                    if e.type == ErrorType.LOGIN_FAILED or attempt == _CONNECT_RETRIES - 1:
+                        raise
+                    delay = _CONNECT_BACKOFF_BASE * (2 ** attempt)
+                    logger.warning(f"Verbindungsaufbau zu Gmail fehlgeschlagen (Versuch {attempt + 1}/{_CONNECT_RETRIES}), neuer Versuch in {delay:.0f}s.")
+                    time.sleep(delay)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class GmailLib:
     def __init__(self, user, password):
         """
         Initialisiert die Gmail-Bibliothek.
         Verbindet sich noch nicht mit dem IMAP-Server.
+        Als Context Manager wird eine Verbindung für den gesamten with-Block gehalten:
+            with GmailLib(user, password) as gmail:
+                gmail.save_email(msg_id, path)
         """
         logger.debug("GmailLib.__init__ gestartet.")
         self.user = user
         self.password = password
         self.mail = None # IMAP-Verbindung wird später aufgebaut
+        self._trash_folder_name = None # Lokalisierter Papierkorb, wird beim ersten Löschen ermittelt
+        self._folder_cache = None # Ergebnis von list_all_folders, gültig für _folder_cache_ttl Sekunden
+        self._folder_cache_ts = 0.0
+        self._folder_cache_ttl = 60
+        self._selected_folder = None # (Ordnername, readonly) des aktuell ausgewählten Ordners
+        self._created_dirs = set() # Lokale Speicherordner, die in dieser Sitzung bereits angelegt wurden
+        self._message_cache = OrderedDict() # (Ordner, msg_id, peek) -> (raw_email, email_message), siehe _fetch_email_message
         logger.debug("GmailLib.__init__ beendet.")
 
+    def __enter__(self):
+        self._login()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._logout()
+        except GMAIL_LIB_EXCEPTION:
+            if exc_type is None:
+                raise
+            # Eine bereits laufende Exception nicht durch den Logout-Fehler überdecken
+        return False
+
+    def is_connected(self):
+        """Gibt True zurück, wenn eine angemeldete IMAP-Verbindung besteht (mit oder ohne ausgewählten Ordner)."""
+        return self.mail is not None and self.mail.state in ('AUTH', 'SELECTED')
+
+    def ping(self):
+        """Prüft mit NOOP, ob die bestehende Verbindung noch lebt. Wirft keine Exception."""
+        if not self.is_connected():
+            return False
+        try:
+            status, _ = self.mail.noop()
+            return status == "OK"
+        except Exception as e:
+            logger.debug(f"NOOP fehlgeschlagen, Verbindung gilt als getrennt: {e}")
+            return False
+
+    def reset_run_state(self):
+        """
+        Verwirft, was nur innerhalb eines Laufs gilt: angelegte Speicherordner (können inzwischen
+        gelöscht oder neu eingehängt sein) und zwischengespeicherte E-Mails (Sequenznummern
+        können sich durch andere Clients verschoben haben). Die Verbindung bleibt bestehen.
+        """
+        self._created_dirs.clear()
+        self._message_cache.clear()
+
     def _login(self):
         """Stellt die Verbindung zu Gmail her und meldet sich an.
         Wirft GMAIL_LIB_EXCEPTION bei Fehlschlag."""
         logger.debug("GmailLib._login gestartet.")
-        if self.mail and self.mail.state == 'AUTH':
+        if self.is_connected():
             logger.debug("Bereits angemeldet.")
             return # Bereits angemeldet, tue nichts
         try:
+            self._selected_folder = None
             self.mail = imaplib.IMAP4_SSL("imap.gmail.com")
             self.mail.login(self.user, self.password)
             logger.info(f"Erfolgreich bei {self.user} angemeldet.")
@@ -76,6 +321,7 @@ class GmailLib:
         Wirft GMAIL_LIB_EXCEPTION bei Fehlschlag."""
         logger.debug("GmailLib._logout gestartet.")
         if self.mail:
+            self._selected_folder = None
             try:
                 self.mail.logout()
                 logger.info("Erfolgreich von Gmail abgemeldet.")
@@ -90,36 +336,55 @@ class GmailLib:
         # Es ist keine Exception nötig.
         return
 
+    def _ensure_selected(self, folder_name, readonly=False):
+        """
+        Wählt einen Ordner nur aus, wenn er nicht bereits (im selben Modus) ausgewählt ist.
+        Gibt (status, data) wie imaplib.IMAP4.select zurück.
+        """
+        if self._selected_folder == (folder_name, readonly):
+            return "OK", []
+        self._selected_folder = None
+        self._message_cache.clear() # Sequenznummern gelten nur innerhalb eines ausgewählten Ordners
+        status, data = self.mail.select(f'"{_encode_folder_name(folder_name)}"', readonly=readonly)
+        if status == "OK":
+            self._selected_folder = (folder_name, readonly)
+        return status, data
+
+    @ensure_connected
     def list_all_folders(self):
         """
         Gibt eine Liste aller Ordner im Gmail-Konto zurück.
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
         """
         logger.debug("GmailLib.list_all_folders gestartet.")
+        if self._folder_cache is not None and time.monotonic() - self._folder_cache_ts < self._folder_cache_ttl:
+            logger.debug("GmailLib.list_all_folders beendet: Ordnerliste aus dem Cache.")
+            return list(self._folder_cache)
         try:
             status, folders = self.mail.list()
             if status == "OK":
                 folder_names = []
                 for folder_line in folders:
-                    decoded_line = folder_line.decode('utf-7')
+                    # Auf den Rohbytes arbeiten; dekodiert wird nur der gefundene Ordnername
+                    selectable = b'\\Noselect' not in folder_line # Hierarchie-Container ausschließen
                     # Verwende Regex, um den Ordnernamen innerhalb der letzten doppelten Anführungszeichen zu finden
-                    match = re.search(r'"([^"]*)"[^"]*$', decoded_line)
+                    match = _FOLDER_LINE_RE.search(folder_line)
                     if match:
-                        folder_name = match.group(1)
-                        # Überprüfe auf den \Noselect Flag, um Hierarchie-Container auszuschließen
-                        if '\\Noselect' not in decoded_line: 
-                            folder_names.append(folder_name)
+                        if selectable:
+                            folder_names.append(_decode_folder_name(match.group(1)))
                     # Andernfalls, wenn kein Regex-Match gefunden wird, versuchen wir den alten Ansatz als Fallback
                     # Dies sollte jedoch mit der neuen Regex-Logik seltener auftreten
-                    elif ')' in decoded_line:
-                        parts = decoded_line.split(')')
+                    elif b')' in folder_line:
+                        parts = folder_line.split(b')')
                         if len(parts) > 1:
-                            potential_name = parts[-1].strip().strip('"')
-                            if potential_name and '\\Noselect' not in decoded_line:
-                                folder_names.append(potential_name)
+                            potential_name = parts[-1].strip().strip(b'"')
+                            if potential_name and selectable:
+                                folder_names.append(_decode_folder_name(potential_name))
                 
+                self._folder_cache = folder_names
+                self._folder_cache_ts = time.monotonic()
                 logger.debug(f"GmailLib.list_all_folders beendet: {folder_names}.")
-                return folder_names
+                return list(folder_names)
             else:
                 error_msg = folders[0].decode() if folders and isinstance(folders, list) and len(folders) > 0 else "Unbekannte Fehlermeldung beim Auflisten der Ordner."
                 logger.error(f"Fehler beim Auflisten der Ordner: {error_msg}")
@@ -157,15 +422,25 @@ class GmailLib:
         Holt alle Nachrichten-IDs aus einem spezifischen Ordner und sortiert sie absteigend.
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
         """
-        logger.debug(f"GmailLib.get_message_ids_in_folder gestartet für Ordner: {folder_name}.")
+        return self.get_message_ids_matching(folder_name, "ALL")
+
+    @ensure_connected
+    def get_message_ids_matching(self, folder_name, criteria, charset=None):
+        """
+        Holt die Nachrichten-IDs eines Ordners, die einem IMAP-SEARCH-Ausdruck entsprechen, und sortiert sie absteigend.
+        Die Filterung übernimmt der Server, z.B. criteria='UNSEEN FROM "foo@bar.de" SINCE 1-Jan-2024'.
+        Für Nicht-ASCII-Suchbegriffe muss charset (z.B. "UTF-8") angegeben werden.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        logger.debug(f"GmailLib.get_message_ids_matching gestartet für Ordner: {folder_name}, Kriterien: {criteria}.")
         try:
-            status, messages_count_raw = self.mail.select(f'"{folder_name}"', readonly=False) # readonly=False für spätere Operationen
+            status, messages_count_raw = self._ensure_selected(folder_name, readonly=False) # readonly=False für spätere Operationen
             if status != "OK":
                 error_msg = messages_count_raw[0].decode() if messages_count_raw and isinstance(messages_count_raw, list) and len(messages_count_raw) > 0 else "Unbekannte Fehlermeldung beim Ordnerauswahl."
                 logger.error(f"Fehler beim Auswählen des Ordners '{folder_name}': {error_msg}")
                 raise GMAIL_LIB_EXCEPTION(type=ErrorType.FOLDER_SELECT_FAILED, message=f"Fehler beim Auswählen des Ordners '{folder_name}': {error_msg}")
 
-            status, raw_message_ids = self.mail.search(None, "ALL")
+            status, raw_message_ids = self.mail.search(charset, criteria)
             if status != "OK":
                 error_msg = raw_message_ids[0].decode() if raw_message_ids and isinstance(raw_message_ids, list) and len(raw_message_ids) > 0 else "Unbekannte Fehlermeldung bei der E-Mail-Suche."
                 logger.error(f"Fehler bei der Suche nach E-Mails im Ordner '{folder_name}': {error_msg}")
@@ -177,27 +452,39 @@ class GmailLib:
 
             # Hier ist die Änderung: Sortiere die IDs absteigend
             message_ids = raw_message_ids[0].split()
-            # Konvertiere in Integer für korrekte Sortierung und dann zurück in Bytes
-            message_ids_int = sorted([int(mid) for mid in message_ids], reverse=True)
-            message_ids_sorted = [str(mid).encode('utf-8') for mid in message_ids_int]
+            # Numerisch sortieren, die Elemente bleiben die Bytes-Objekte aus der SEARCH-Antwort
+            message_ids.sort(key=int, reverse=True)
 
-            logger.debug(f"GmailLib.get_message_ids_in_folder beendet: {len(message_ids_sorted)} IDs gefunden (absteigend sortiert).")
-            return message_ids_sorted
+            logger.debug(f"GmailLib.get_message_ids_matching beendet: {len(message_ids)} IDs gefunden (absteigend sortiert).")
+            return message_ids
         except imaplib.IMAP4.error as e:
+            self._selected_folder = None # Verbindungszustand unklar, beim nächsten Mal neu auswählen
             logger.error(f"IMAP-Fehler beim Abrufen der Nachrichten-IDs aus '{folder_name}': {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.SEARCH_FAILED, message=f"IMAP-Fehler beim Abrufen der Nachrichten-IDs aus '{folder_name}': {e}")
         except Exception as e:
+            self._selected_folder = None
             logger.error(f"Unerwarteter Fehler beim Abrufen der Nachrichten-IDs aus '{folder_name}': {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Fehler beim Abrufen der Nachrichten-IDs: {e}")
 
-    def _fetch_email_message(self, msg_id):
+    @ensure_connected
+    def _fetch_email_message(self, msg_id, peek=True):
         """
         Hilfsmethode: Holt eine E-Mail im Rohformat und parst sie.
+        Mit peek=True (Standard) wird BODY.PEEK[] verwendet, das \\Seen-Flag bleibt unverändert;
+        peek=False entspricht dem bisherigen RFC822-Abruf, der die E-Mail als gelesen markiert.
+        Die letzten _MESSAGE_CACHE_SIZE Ergebnisse werden zwischengespeichert, damit z.B. save_email und
+        save_attachments dieselbe E-Mail nicht zweimal abrufen und parsen.
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
         """
         logger.debug(f"GmailLib._fetch_email_message gestartet für msg_id: {msg_id.decode()}.")
+        cache_key = (self._selected_folder, msg_id, peek)
+        cached = self._message_cache.get(cache_key)
+        if cached is not None:
+            self._message_cache.move_to_end(cache_key)
+            logger.debug(f"GmailLib._fetch_email_message beendet für msg_id: {msg_id.decode()} (aus dem Cache).")
+            return cached
         try:
-            status, data = self.mail.fetch(msg_id, "(RFC822)")
+            status, data = self.mail.fetch(msg_id, _FETCH_PEEK_PARTS if peek else _FETCH_SEEN_PARTS)
             if status != "OK" or not data or not isinstance(data, list) or len(data) == 0 or not data[0] or not isinstance(data[0], tuple) or len(data[0]) < 2:
                 error_msg = f"Konnte E-Mail mit ID {msg_id.decode()} nicht abrufen oder Daten sind unvollständig. Status: {status}, Data: {data}."
                 logger.warning(error_msg) # Log as warning, then raise specific exception
@@ -205,84 +492,174 @@ class GmailLib:
             
             raw_email = data[0][1]
             email_message = email.message_from_bytes(raw_email)
+            self._message_cache[cache_key] = (raw_email, email_message)
+            if len(self._message_cache) > _MESSAGE_CACHE_SIZE:
+                self._message_cache.popitem(last=False)
             logger.debug(f"GmailLib._fetch_email_message beendet für msg_id: {msg_id.decode()}.")
             return raw_email, email_message
         except imaplib.IMAP4.error as e:
+            self._selected_folder = None
             logger.error(f"IMAP-Fehler beim Abrufen der E-Mail {msg_id.decode()}: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=f"IMAP-Fehler beim Abrufen der E-Mail {msg_id.decode()}: {e}")
         except Exception as e: # Catch any other unexpected exceptions
+            self._selected_folder = None
             logger.error(f"Unerwarteter Fehler beim Abrufen der E-Mail {msg_id.decode()}: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Fehler beim Abrufen der E-Mail {msg_id.decode()}: {e}")
 
-    def has_attachments(self, msg_id):
+    @ensure_connected
+    def bulk_fetch(self, msg_ids, parts=None, batch_size=100, peek=True):
+        """
+        Holt mehrere E-Mails mit einem FETCH pro Block von batch_size IDs statt einem FETCH pro E-Mail.
+        Ohne parts wird je nach peek BODY.PEEK[] (\\Seen bleibt unverändert) oder RFC822 abgerufen.
+        Liefert (msg_id, raw_email, email_message)-Tupel in der Reihenfolge von msg_ids.
+        Der Ordner muss bereits ausgewählt sein (z.B. durch get_message_ids_in_folder).
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        msg_ids = list(msg_ids)
+        if parts is None:
+            parts = _FETCH_PEEK_PARTS if peek else _FETCH_SEEN_PARTS
+        logger.debug(f"GmailLib.bulk_fetch gestartet für {len(msg_ids)} IDs (Blockgröße {batch_size}).")
+        for start in range(0, len(msg_ids), batch_size):
+            batch = msg_ids[start:start + batch_size]
+            sequence_set = _to_sequence_set(batch)
+            try:
+                status, data = self.mail.fetch(sequence_set, parts)
+            except imaplib.IMAP4.error as e:
+                self._selected_folder = None
+                logger.error(f"IMAP-Fehler beim Abrufen der E-Mails {sequence_set}: {e}", exc_info=True)
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=f"IMAP-Fehler beim Abrufen der E-Mails {sequence_set}: {e}")
+            if status != "OK" or not data or not isinstance(data, list):
+                error_msg = f"Konnte E-Mails {sequence_set} nicht abrufen. Status: {status}."
+                logger.error(error_msg)
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=error_msg)
+
+            # data enthält abwechselnd (Umschlag, Inhalt)-Tupel und b')'-Trenner
+            raw_by_id = {}
+            for item in data:
+                if not isinstance(item, tuple) or len(item) < 2:
+                    continue
+                match = _FETCH_ID_RE.match(item[0])
+                if match:
+                    raw_by_id[int(match.group(1))] = item[1]
+
+            for msg_id in batch:
+                raw_email = raw_by_id.get(int(msg_id))
+                if raw_email is None:
+                    logger.warning(f"E-Mail mit ID {msg_id.decode()} fehlt in der FETCH-Antwort und wird übersprungen.")
+                    continue
+                yield msg_id, raw_email, email.message_from_bytes(raw_email)
+        logger.debug("GmailLib.bulk_fetch beendet.")
+
+    def has_attachments(self, msg_id, email_message=None):
         """
         Prüft, ob ein Objekt (E-Mail) Anlagen hat.
+        Eine bereits geparste E-Mail (z.B. aus bulk_fetch) kann über email_message übergeben werden.
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern beim Abrufen der E-Mail.
         """
         logger.debug(f"GmailLib.has_attachments gestartet für msg_id: {msg_id.decode()}.")
-        try:
-            _, email_message = self._fetch_email_message(msg_id)
-        except GMAIL_LIB_EXCEPTION as e:
-            logger.debug(f"GmailLib.has_attachments beendet: Fehler beim Holen der E-Mail ({e.message}).")
-            raise # Leite die Exception einfach weiter
+        if email_message is None:
+            # Ohne geparste E-Mail reicht die MIME-Struktur, der Inhalt muss nicht übertragen werden
+            has_any = self._has_attachments_from_bodystructure(msg_id)
+            logger.debug(f"GmailLib.has_attachments beendet für msg_id {msg_id.decode()}: {has_any}.")
+            return has_any
 
         has_any = False
+        # Content-Disposition zuerst prüfen: trifft auf die meisten Teile nicht zu, is_multipart() entfällt dann
         for part in email_message.walk():
-            if part.get_content_maintype() == "multipart":
-                continue
-            if part.get("Content-Disposition") is not None:
+            if part.get("Content-Disposition") is not None and not part.is_multipart():
                 has_any = True
                 break
         logger.debug(f"GmailLib.has_attachments beendet für msg_id {msg_id.decode()}: {has_any}.")
         return has_any
 
+    @ensure_connected
+    def _has_attachments_from_bodystructure(self, msg_id):
+        """
+        Prüft anhand von BODYSTRUCTURE, ob ein MIME-Teil eine Content-Disposition (attachment/inline) hat.
+        Überträgt nur die MIME-Metadaten statt der kompletten E-Mail.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        try:
+            status, data = self.mail.fetch(msg_id, "(BODYSTRUCTURE)")
+        except imaplib.IMAP4.error as e:
+            self._selected_folder = None
+            logger.error(f"IMAP-Fehler beim Abrufen der BODYSTRUCTURE von {msg_id.decode()}: {e}", exc_info=True)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=f"IMAP-Fehler beim Abrufen der E-Mail {msg_id.decode()}: {e}")
+        if status != "OK" or not data or not data[0]:
+            error_msg = f"Konnte BODYSTRUCTURE der E-Mail mit ID {msg_id.decode()} nicht abrufen. Status: {status}, Data: {data}."
+            logger.warning(error_msg)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FETCH_FAILED, message=error_msg)
+
+        # Antwortteile zusammenfügen (bei Literalen liefert imaplib Tupel)
+        chunks = []
+        for item in data:
+            if isinstance(item, tuple):
+                chunks.extend(part for part in item if isinstance(part, bytes))
+            elif isinstance(item, bytes):
+                chunks.append(item)
+        structure = b"".join(chunks).lower()
+        return b'("attachment"' in structure or b'("inline"' in structure
+
     def _sanitize_filename(self, filename, max_length=200):
         """Bereinigt Dateinamen von ungültigen Zeichen und kürzt sie."""
-        clean_filename = "".join(x for x in filename if x.isalnum() or x in " ._-").strip()
+        clean_filename = _SANITIZE_RE.sub("", filename).strip()
         if not clean_filename:
             return "untitled_file" # Fallback
         clean_filename = clean_filename[:max_length]
-        return " ".join(clean_filename.split()).strip()
+        return _MULTI_SPACE_RE.sub(" ", clean_filename).strip()
 
-    def save_email(self, msg_id, save_path_base):
+    def _ensure_local_dir(self, path, label):
+        """
+        Legt einen lokalen Speicherordner an, falls nötig. Bereits angelegte Pfade werden
+        in dieser Sitzung nicht erneut geprüft.
+        Wirft GMAIL_LIB_EXCEPTION bei Dateisystem-Fehlern.
+        """
+        if path in self._created_dirs:
+            return
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Dateisystem-Fehler beim Erstellen des {label} '{path}': {e}", exc_info=True)
+            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Erstellen des {label} '{path}': {e}")
+        self._created_dirs.add(path)
+
+    def save_email(self, msg_id, save_path_base, raw_email=None, email_message=None):
         """
         Speichert ein Objekt (E-Mail) in einem File-Ordner.
+        Bereits abgerufene Daten (z.B. aus bulk_fetch) können über raw_email/email_message übergeben werden.
         Wirft GMAIL_LIB_EXCEPTION bei Dateisystem- oder Gmail-Fehlern.
         """
         logger.debug(f"GmailLib.save_email gestartet für msg_id: {msg_id.decode()}, path: {save_path_base}.")
         emails_save_path = os.path.join(save_path_base, "E-Mails")
-        try:
-            if not os.path.exists(emails_save_path):
-                os.makedirs(emails_save_path)
-                logger.info(f"Lokaler Ordner '{emails_save_path}' wurde erstellt.")
-        except Exception as e:
-            logger.error(f"Dateisystem-Fehler beim Erstellen des E-Mail-Speicherordners '{emails_save_path}': {e}", exc_info=True)
-            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Erstellen des E-Mail-Speicherordners '{emails_save_path}': {e}")
+        self._ensure_local_dir(emails_save_path, "E-Mail-Speicherordners")
 
-        try:
-            raw_email, email_message = self._fetch_email_message(msg_id) # Diese Methode kann GMAIL_LIB_EXCEPTION werfen
-        except GMAIL_LIB_EXCEPTION as e:
-            # Fängt spezifischen Gmail-Fehler von _fetch_email_message ab und wirft ihn als GMAIL_ERROR weiter
-            raise GMAIL_LIB_EXCEPTION(type=ErrorType.GMAIL_ERROR, message=f"Fehler beim Abrufen der E-Mail zum Speichern: {e.message}")
+        if raw_email is None or email_message is None:
+            try:
+                raw_email, email_message = self._fetch_email_message(msg_id) # Diese Methode kann GMAIL_LIB_EXCEPTION werfen
+            except GMAIL_LIB_EXCEPTION as e:
+                # Fängt spezifischen Gmail-Fehler von _fetch_email_message ab und wirft ihn als GMAIL_ERROR weiter
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.GMAIL_ERROR, message=f"Fehler beim Abrufen der E-Mail zum Speichern: {e.message}")
 
         subject = email_message.get("Subject", "Ohne Betreff")
-        subject_decoded = ""
-        for part, encoding in decode_header(subject):
-            if isinstance(part, bytes):
-                try:
-                    subject_decoded += part.decode(encoding or "utf-8")
-                except (UnicodeDecodeError, TypeError):
-                    subject_decoded += part.decode("latin-1", errors="ignore")
-            else:
-                subject_decoded += part
+        if isinstance(subject, str) and '=?' not in subject:
+            subject_decoded = subject # Keine Encoded-Words (RFC 2047), Dekodierung nicht nötig
+        else:
+            subject_decoded = ""
+            for part, encoding in decode_header(subject):
+                if isinstance(part, bytes):
+                    try:
+                        subject_decoded += part.decode(encoding or "utf-8")
+                    except (UnicodeDecodeError, TypeError):
+                        subject_decoded += part.decode("latin-1", errors="ignore")
+                else:
+                    subject_decoded += part
         
         email_filename = self._sanitize_filename(subject_decoded)
         email_filename = f"{email_filename}_{msg_id.decode()}.eml" # Eindeutigkeit durch ID
         email_filepath = os.path.join(emails_save_path, email_filename)
 
         try:
-            with open(email_filepath, "wb") as f_email:
-                f_email.write(raw_email)
+            _write_bytes(email_filepath, raw_email)
             logger.info(f"E-Mail als '{email_filename}' in '{emails_save_path}' gespeichert.")
             logger.debug("GmailLib.save_email beendet: Erfolg.")
             return # Erfolgreich gespeichert
@@ -291,54 +668,58 @@ class GmailLib:
             logger.debug("GmailLib.save_email beendet: Fehler beim Dateisystem.")
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Speichern der E-Mail '{email_filename}': {e}")
 
-    def save_attachments(self, msg_id, save_path_base):
+    def save_attachments(self, msg_id, save_path_base, email_message=None):
         """
         Speichert alle Anlagen eines Objektes (E-Mail) in einem File-Ordner.
+        Eine bereits geparste E-Mail (z.B. aus bulk_fetch) kann über email_message übergeben werden.
         Wirft GMAIL_LIB_EXCEPTION bei Dateisystem- oder Gmail-Fehlern.
         """
         logger.debug(f"GmailLib.save_attachments gestartet für msg_id: {msg_id.decode()}, path: {save_path_base}.")
         attachments_save_path = os.path.join(save_path_base, "Anlagen")
-        try:
-            if not os.path.exists(attachments_save_path):
-                os.makedirs(attachments_save_path)
-                logger.info(f"Lokaler Ordner '{attachments_save_path}' wurde erstellt.")
-        except Exception as e:
-            logger.error(f"Dateisystem-Fehler beim Erstellen des Anhänge-Speicherordners '{attachments_save_path}': {e}", exc_info=True)
-            raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Erstellen des Anhänge-Speicherordners '{attachments_save_path}': {e}")
+        self._ensure_local_dir(attachments_save_path, "Anhänge-Speicherordners")
 
-        try:
-            _, email_message = self._fetch_email_message(msg_id) # Diese Methode kann GMAIL_LIB_EXCEPTION werfen
-        except GMAIL_LIB_EXCEPTION as e:
-            logger.error(f"Fehler beim Abrufen der E-Mail zum Speichern von Anhängen: {e.message}", exc_info=True)
-            logger.debug("GmailLib.save_attachments beendet: Fehler beim Abrufen der E-Mail.")
-            raise GMAIL_LIB_EXCEPTION(type=ErrorType.GMAIL_ERROR, message=f"Fehler beim Abrufen der E-Mail zum Speichern von Anhängen: {e.message}")
+        if email_message is None:
+            try:
+                _, email_message = self._fetch_email_message(msg_id) # Diese Methode kann GMAIL_LIB_EXCEPTION werfen
+            except GMAIL_LIB_EXCEPTION as e:
+                logger.error(f"Fehler beim Abrufen der E-Mail zum Speichern von Anhängen: {e.message}", exc_info=True)
+                logger.debug("GmailLib.save_attachments beendet: Fehler beim Abrufen der E-Mail.")
+                raise GMAIL_LIB_EXCEPTION(type=ErrorType.GMAIL_ERROR, message=f"Fehler beim Abrufen der E-Mail zum Speichern von Anhängen: {e.message}")
 
-        attachments_saved = 0
+        # Erst alle Anhänge einsammeln, dann parallel schreiben (Datei-I/O gibt den GIL frei)
+        jobs = []
+        sanitize = self._sanitize_filename
+        msg_id_str = msg_id.decode()
         for part in email_message.walk():
-            if part.get_content_maintype() == "multipart" or part.get("Content-Disposition") is None:
+            if part.get("Content-Disposition") is None or part.is_multipart():
                 continue
             
             filename = part.get_filename()
             if filename:
-                clean_filename = self._sanitize_filename(filename)
+                clean_filename = sanitize(filename)
                 # Füge msg_id hinzu, um Dateinamen bei Duplikaten eindeutig zu machen
                 # Behalte die ursprüngliche Dateiendung bei
                 original_extension = filename.split('.')[-1] if '.' in filename else ''
                 if original_extension and len(original_extension) <= 5: # Kurze Endungen behalten
-                     final_filename = f"{clean_filename}_{msg_id.decode()}_{attachments_saved}.{original_extension}"
+                     final_filename = f"{clean_filename}_{msg_id_str}_{len(jobs)}.{original_extension}"
                 else: # Sonst keine Endung oder zu lange Endung
-                     final_filename = f"{clean_filename}_{msg_id.decode()}_{attachments_saved}"
+                     final_filename = f"{clean_filename}_{msg_id_str}_{len(jobs)}"
 
                 filepath = os.path.join(attachments_save_path, final_filename)
-                
-                try:
-                    with open(filepath, "wb") as f_attachment:
-                        f_attachment.write(part.get_payload(decode=True))
-                    logger.info(f"Anhang '{final_filename}' gespeichert in '{attachments_save_path}'.")
-                    attachments_saved += 1
-                except Exception as e:
-                    logger.error(f"Dateisystem-Fehler beim Speichern des Anhangs '{final_filename}': {e}", exc_info=True)
-                    raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Speichern des Anhangs '{final_filename}': {e}")
+                jobs.append((final_filename, filepath, part))
+
+        attachments_saved = 0
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(_ATTACHMENT_WRITE_WORKERS, len(jobs))) as executor:
+                futures = [(final_filename, executor.submit(_write_part_payload, filepath, part)) for final_filename, filepath, part in jobs]
+                for final_filename, future in futures:
+                    try:
+                        future.result()
+                        logger.info(f"Anhang '{final_filename}' gespeichert in '{attachments_save_path}'.")
+                        attachments_saved += 1
+                    except Exception as e:
+                        logger.error(f"Dateisystem-Fehler beim Speichern des Anhangs '{final_filename}': {e}", exc_info=True)
+                        raise GMAIL_LIB_EXCEPTION(type=ErrorType.FILESYSTEM_ERROR, message=f"Dateisystem-Fehler beim Speichern des Anhangs '{final_filename}': {e}")
         
         logger.debug(f"GmailLib.save_attachments beendet für msg_id {msg_id.decode()}: {attachments_saved} Anhänge gespeichert.")
         return # Erfolgreich gespeichert
@@ -349,81 +730,135 @@ class GmailLib:
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
         """
         logger.debug(f"GmailLib.move_object gestartet für msg_id: {msg_id.decode()} von '{source_folder}' nach '{target_folder}'.")
+        self.move_objects([msg_id], source_folder, target_folder)
+
+    @ensure_connected
+    def move_objects(self, msg_ids, source_folder, target_folder, batch_size=1000):
+        """
+        Verschiebt mehrere Objekte (E-Mails) von einem Ordner in einen anderen Ordner.
+        Pro Block von max. batch_size IDs (RFC 2683 empfiehlt höchstens ~1000) wird ein COPY und ein STORE
+        mit einem Sequence-Set abgesetzt, am Ende genau ein EXPUNGE.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        msg_ids = list(msg_ids)
+        logger.debug(f"GmailLib.move_objects gestartet für {len(msg_ids)} E-Mails von '{source_folder}' nach '{target_folder}'.")
+        if not msg_ids:
+            return
         try:
-            # Stelle sicher, dass der Quellordner ausgewählt ist, um die msg_id zu finden
-            self.mail.select(f'"{source_folder}"')
-            
-            # Kopiere die E-Mail in den Zielordner
-            status_copy, response_copy = self.mail.copy(msg_id, f'"{target_folder}"')
-            if status_copy != "OK":
-                error_msg = response_copy[0].decode() if response_copy and isinstance(response_copy, list) and len(response_copy) > 0 else "Unbekannter Fehler beim Kopieren."
-                logger.error(f"Fehler beim Kopieren der E-Mail {msg_id.decode()} nach '{target_folder}': {error_msg}")
-                raise GMAIL_LIB_EXCEPTION(type=ErrorType.COPY_FAILED, message=f"Fehler beim Kopieren der E-Mail nach '{target_folder}': {error_msg}")
-            
-            # Markiere die E-Mail im Quellordner als gelöscht
-            status_store, response_store = self.mail.store(msg_id, '+FLAGS', '\\Deleted')
-            if status_store != "OK":
-                error_msg = response_store[0].decode() if response_store and isinstance(response_store, list) and len(response_store) > 0 else "Unbekannter Fehler beim Markieren als gelöscht."
-                logger.warning(f"Warnung: Konnte E-Mail {msg_id.decode()} im Quellordner '{source_folder}' nicht als gelöscht markieren: {error_msg}")
-                # Wir werfen hier keine Exception, da das Kopieren erfolgreich war und das Verschieben primärziel ist.
-            
+            # Stelle sicher, dass der Quellordner ausgewählt ist, um die msg_ids zu finden
+            self._ensure_selected(source_folder)
+
+            for start in range(0, len(msg_ids), batch_size):
+                sequence_set = _to_sequence_set(msg_ids[start:start + batch_size])
+
+                # Kopiere die E-Mails in den Zielordner
+                status_copy, response_copy = self.mail.copy(sequence_set, f'"{_encode_folder_name(target_folder)}"')
+                if status_copy != "OK":
+                    error_msg = response_copy[0].decode() if response_copy and isinstance(response_copy, list) and len(response_copy) > 0 else "Unbekannter Fehler beim Kopieren."
+                    logger.error(f"Fehler beim Kopieren der E-Mails {sequence_set} nach '{target_folder}': {error_msg}")
+                    raise GMAIL_LIB_EXCEPTION(type=ErrorType.COPY_FAILED, message=f"Fehler beim Kopieren der E-Mail nach '{target_folder}': {error_msg}")
+
+                # Markiere die E-Mails im Quellordner als gelöscht
+                status_store, response_store = self.mail.store(sequence_set, '+FLAGS', '\\Deleted')
+                if status_store != "OK":
+                    error_msg = response_store[0].decode() if response_store and isinstance(response_store, list) and len(response_store) > 0 else "Unbekannter Fehler beim Markieren als gelöscht."
+                    logger.warning(f"Warnung: Konnte E-Mails {sequence_set} im Quellordner '{source_folder}' nicht als gelöscht markieren: {error_msg}")
+                    # Wir werfen hier keine Exception, da das Kopieren erfolgreich war und das Verschieben primärziel ist.
+
             self.mail.expunge() # Wichtig, um die Löschung zu finalisieren
-            logger.info(f"E-Mail {msg_id.decode()} erfolgreich von '{source_folder}' nach '{target_folder}' verschoben.")
-            logger.debug("GmailLib.move_object beendet: Erfolg.")
+            self._message_cache.clear() # Nach EXPUNGE verschieben sich die Sequenznummern
+            logger.info(f"{len(msg_ids)} E-Mails erfolgreich von '{source_folder}' nach '{target_folder}' verschoben.")
+            logger.debug("GmailLib.move_objects beendet: Erfolg.")
             return # Erfolgreich verschoben
+        except GMAIL_LIB_EXCEPTION:
+            raise
         except imaplib.IMAP4.error as e:
-            logger.error(f"IMAP-Fehler beim Verschieben der E-Mail {msg_id.decode()}: {e}", exc_info=True)
+            self._selected_folder = None
+            logger.error(f"IMAP-Fehler beim Verschieben der E-Mails: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.MOVE_FAILED, message=f"IMAP-Fehler beim Verschieben der E-Mail: {e}")
         except Exception as e:
-            logger.error(f"Unerwarteter Fehler beim Verschieben der E-Mail {msg_id.decode()}: {e}", exc_info=True)
+            self._selected_folder = None
+            logger.error(f"Unerwarteter Fehler beim Verschieben der E-Mails: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Fehler beim Verschieben der E-Mail: {e}")
 
+    def _get_trash_folder_name(self):
+        """
+        Ermittelt den (ggf. lokalisierten) Papierkorb-Ordner einmalig und merkt ihn sich für weitere Aufrufe.
+        Fällt auf 'Trash' zurück, wenn kein passender Ordner gefunden wird.
+        """
+        if self._trash_folder_name is not None:
+            return self._trash_folder_name
+
+        trash_folder_name = "Trash" # Default für internationale Konten, wird versucht zu lokalisieren
+        try:
+            trash_folder_status, trash_folders_raw = self.mail.list('', '%Trash%')
+            if trash_folder_status == "OK" and trash_folders_raw:
+                for f_raw in trash_folders_raw:
+                    # IMAP LIST response is in Modified UTF-7 (e.g. localized folder names).
+                    f_decoded = _decode_folder_name(f_raw)
+                    # Heuristik: Check for common localized trash folder names
+                    if 'Trash' in f_decoded or 'Papierkorb' in f_decoded:
+                        # Extract the actual folder name, which is usually the last part after '"/"' or '") "'
+                        parts = f_decoded.split(')"')
+                        if len(parts) > 1:
+                            potential_name = parts[-1].strip().strip('"')
+                            if potential_name:
+                                trash_folder_name = potential_name
+                                break
+            self._trash_folder_name = trash_folder_name
+        except Exception as e:
+            logger.warning(f"Konnte lokalen Papierkorb-Ordner nicht zuverlässig finden, nutze Standard 'Trash'. Fehler: {e}")
+        return trash_folder_name
+
     def delete_object_to_trash(self, msg_id, folder_name):
         """
         Löscht ein Objekt (E-Mail) in einem Ordner (verschiebt es in den Papierkorb).
         Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
         """
         logger.debug(f"GmailLib.delete_object_to_trash gestartet für msg_id: {msg_id.decode()} in Ordner: {folder_name}.")
+        self.delete_objects_to_trash([msg_id], folder_name)
+
+    @ensure_connected
+    def delete_objects_to_trash(self, msg_ids, folder_name, batch_size=1000):
+        """
+        Löscht mehrere Objekte (E-Mails) in einem Ordner (verschiebt sie in den Papierkorb).
+        Ein COPY und ein STORE pro Block von max. batch_size IDs, am Ende genau ein EXPUNGE.
+        Wirft GMAIL_LIB_EXCEPTION bei IMAP-Fehlern.
+        """
+        msg_ids = list(msg_ids)
+        logger.debug(f"GmailLib.delete_objects_to_trash gestartet für {len(msg_ids)} E-Mails in Ordner: {folder_name}.")
+        if not msg_ids:
+            return
         try:
-            self.mail.select(f'"{folder_name}"')
-            
-            trash_folder_name = "Trash" # Default für internationale Konten, wird versucht zu lokalisieren
-            try:
-                trash_folder_status, trash_folders_raw = self.mail.list('', '%Trash%')
-                if trash_folder_status == "OK" and trash_folders_raw:
-                    for f_raw in trash_folders_raw:
-                        # IMAP LIST response might be in Modified UTF-7. Decode carefully.
-                        f_decoded = f_raw.decode('utf-7', errors='ignore')
-                        # Heuristik: Check for common localized trash folder names
-                        if 'Trash' in f_decoded or 'Papierkorb' in f_decoded:
-                            # Extract the actual folder name, which is usually the last part after '"/"' or '") "'
-                            parts = f_decoded.split(')"')
-                            if len(parts) > 1:
-                                potential_name = parts[-1].strip().strip('"')
-                                if potential_name:
-                                    trash_folder_name = potential_name
-                                    break
-            except Exception as e:
-                logger.warning(f"Konnte lokalen Papierkorb-Ordner nicht zuverlässig finden, nutze Standard 'Trash'. Fehler: {e}")
+            self._ensure_selected(folder_name)
+            trash_folder_name = self._get_trash_folder_name()
+
+            for start in range(0, len(msg_ids), batch_size):
+                sequence_set = _to_sequence_set(msg_ids[start:start + batch_size])
+
+                status_copy, response_copy = self.mail.copy(sequence_set, f'"{_encode_folder_name(trash_folder_name)}"')
+                if status_copy != "OK":
+                    error_msg = response_copy[0].decode() if response_copy and isinstance(response_copy, list) and len(response_copy) > 0 else "Unbekannter Fehler beim Kopieren in den Papierkorb."
+                    logger.error(f"Fehler beim Kopieren der E-Mails {sequence_set} in den Papierkorb '{trash_folder_name}': {error_msg}")
+                    raise GMAIL_LIB_EXCEPTION(type=ErrorType.DELETE_TO_TRASH_FAILED, message=f"Fehler beim Kopieren in den Papierkorb: {error_msg}")
+
+                status_store, response_store = self.mail.store(sequence_set, '+FLAGS', '\\Deleted')
+                if status_store != "OK":
+                    error_msg = response_store[0].decode() if response_store and isinstance(response_store, list) and len(response_store) > 0 else "Unbekannter Fehler beim Markieren als gelöscht."
+                    logger.warning(f"Warnung: Konnte E-Mails {sequence_set} im Ordner '{folder_name}' nicht als gelöscht markieren: {error_msg}")
 
-            status_copy, response_copy = self.mail.copy(msg_id, f'"{trash_folder_name}"')
-            if status_copy != "OK":
-                error_msg = response_copy[0].decode() if response_copy and isinstance(response_copy, list) and len(response_copy) > 0 else "Unbekannter Fehler beim Kopieren in den Papierkorb."
-                logger.error(f"Fehler beim Kopieren der E-Mail {msg_id.decode()} in den Papierkorb '{trash_folder_name}': {error_msg}")
-                raise GMAIL_LIB_EXCEPTION(type=ErrorType.DELETE_TO_TRASH_FAILED, message=f"Fehler beim Kopieren in den Papierkorb: {error_msg}")
-            
-            status_store, response_store = self.mail.store(msg_id, '+FLAGS', '\\Deleted')
-            if status_store != "OK":
-                error_msg = response_store[0].decode() if response_store and isinstance(response_store, list) and len(response_store) > 0 else "Unbekannter Fehler beim Markieren als gelöscht."
-                logger.warning(f"Warnung: Konnte E-Mail {msg_id.decode()} im Ordner '{folder_name}' nicht als gelöscht markieren: {error_msg}")
-            
             self.mail.expunge() # Endgültiges Löschen aus dem Quellordner
-            logger.info(f"E-Mail {msg_id.decode()} erfolgreich in den Papierkorb verschoben.")
-            logger.debug("GmailLib.delete_object_to_trash beendet: Erfolg.")
+            self._message_cache.clear() # Nach EXPUNGE verschieben sich die Sequenznummern
+            logger.info(f"{len(msg_ids)} E-Mails erfolgreich in den Papierkorb verschoben.")
+            logger.debug("GmailLib.delete_objects_to_trash beendet: Erfolg.")
             return # Erfolgreich gelöscht
+        except GMAIL_LIB_EXCEPTION:
+            raise
         except imaplib.IMAP4.error as e:
-            logger.error(f"IMAP-Fehler beim Löschen der E-Mail {msg_id.decode()} in den Papierkorb: {e}", exc_info=True)    
+            self._selected_folder = None
+            logger.error(f"IMAP-Fehler beim Löschen der E-Mails in den Papierkorb: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.DELETE_TO_TRASH_FAILED, message=f"IMAP-Fehler beim Löschen der E-Mail in den Papierkorb: {e}")
         except Exception as e:
-            logger.error(f"Unerwarteter Fehler beim Löschen der E-Mail {msg_id.decode()} in den Papierkorb: {e}", exc_info=True)
+            self._selected_folder = None
+            logger.error(f"Unerwarteter Fehler beim Löschen der E-Mails in den Papierkorb: {e}", exc_info=True)
             raise GMAIL_LIB_EXCEPTION(type=ErrorType.UNKNOWN_ERROR, message=f"Unerwarteter Fehler beim Löschen der E-Mail in den Papierkorb: {e}")
@@ -1,10 +1,78 @@
 # myproject/myapp/gmail_processor.py
 
 import logging, os
+import hashlib
+import threading
+import time
 from .gmail_lib import GmailLib, GMAIL_LIB_EXCEPTION, ErrorType # Importiere die Klasse und die Exception
 
 logger = logging.getLogger(__name__)
 
+# E-Mails pro FETCH-Block und pro COPY/STORE/EXPUNGE beim Verschieben
+BATCH_SIZE = 100
+
+# Angemeldete Verbindungen werden zwischen Aufrufen wiederverwendet (Gmail trennt inaktive
+# IMAP-Verbindungen nach ca. 30 Minuten). Eine Verbindung wird während eines Laufs aus dem
+# Pool entnommen, parallele Läufe mit denselben Zugangsdaten erhalten daher eigene Verbindungen.
+CLIENT_IDLE_TIMEOUT = 25 * 60
+_CLIENT_POOL = {} # Schlüssel -> (GmailLib, Zeitpunkt der letzten Nutzung)
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _pool_key(user, password):
+    # Zugangsdaten nicht im Klartext als Schlüssel ablegen
+    return hashlib.sha256(f"{user}\0{password}".encode("utf-8")).hexdigest()
+
+
+def _discard_client(gmail_client):
+    try:
+        gmail_client._logout()
+    except Exception as e:
+        logger.debug(f"Fehler beim Abmelden einer verworfenen Gmail-Verbindung: {e}")
+
+
+def _checkout_client(user, password):
+    """Liefert eine noch lebende Verbindung aus dem Pool oder einen neuen (noch nicht angemeldeten) GmailLib."""
+    with _CLIENT_POOL_LOCK:
+        entry = _CLIENT_POOL.pop(_pool_key(user, password), None)
+    if entry:
+        gmail_client, last_used = entry
+        if time.monotonic() - last_used < CLIENT_IDLE_TIMEOUT and gmail_client.ping():
+            logger.debug("Verwende bestehende Gmail-Verbindung aus dem Pool.")
+            gmail_client.reset_run_state()
+            return gmail_client
+        _discard_client(gmail_client)
+    return GmailLib(user, password)
+
+
+class _BatchMoveError(Exception):
+    """Ein Block von E-Mails konnte nicht verschoben werden; die Meldung nennt den Block."""
+
+
+def _move_batch(gmail_client, batch, source_folder, target_folder):
+    """
+    Verschiebt einen Block von E-Mails (absteigende IDs) und gibt dessen Größe zurück.
+    Wirft _BatchMoveError mit erster/letzter ID und Anzahl statt einer einzelnen, unbeteiligten ID.
+    """
+    try:
+        gmail_client.move_objects(batch, source_folder, target_folder)
+    except Exception as e:
+        detail = e.message if isinstance(e, GMAIL_LIB_EXCEPTION) else e
+        raise _BatchMoveError(
+            f"Fehler beim Verschieben von {len(batch)} E-Mails (IDs {batch[0].decode()} bis {batch[-1].decode()}): {detail}"
+        ) from e
+    logger.debug("%s E-Mails erfolgreich verarbeitet und verschoben.", len(batch))
+    return len(batch)
+
+
+def _checkin_client(user, password, gmail_client):
+    """Gibt eine Verbindung nach einem erfolgreichen Lauf an den Pool zurück."""
+    with _CLIENT_POOL_LOCK:
+        previous = _CLIENT_POOL.get(_pool_key(user, password))
+        _CLIENT_POOL[_pool_key(user, password)] = (gmail_client, time.monotonic())
+    if previous and previous[0] is not gmail_client:
+        _discard_client(previous[0])
+
 def run_email_automation(user, password, source_folder, target_folder, save_path):
     logger.debug("run_email_automation (Orchestrator) gestartet.")
     
@@ -12,11 +80,14 @@ def run_email_automation(user, password, source_folder, target_folder, save_path
     # und erstellen selbst die Unterordner 'Anlagen' und 'E-Mails'.
     
     gmail_client = None # Initialisiere als None für den finally-Block
+    msg_id = None # Bleibt None, wenn der Fehler vor der E-Mail-Schleife auftritt
+    success = False
+    failed = False # Nach Fehlern wird die Verbindung geschlossen statt wiederverwendet
     
     try:
-        gmail_client = GmailLib(user, password)
+        gmail_client = _checkout_client(user, password)
         
-        # 1. Login-Versuch. Wenn dies fehlschlägt, wird eine GMAIL_LIB_EXCEPTION geworfen.
+        # 1. Login-Versuch (entfällt bei einer Verbindung aus dem Pool). Wenn dies fehlschlägt, wird eine GMAIL_LIB_EXCEPTION geworfen.
         logger.debug("Versuche Login zur GmailLib.")
         gmail_client._login()
         logger.debug("Login erfolgreich.")
@@ -43,47 +114,74 @@ def run_email_automation(user, password, source_folder, target_folder, save_path
             logger.info(f"Keine neuen E-Mails im Ordner '{source_folder}' gefunden, die verarbeitet werden müssen.")
             return True, f"Keine neuen E-Mails im Ordner '{source_folder}' gefunden, die verarbeitet werden müssen."
         
-        success = False
         processed_count = 0
         total_emails = len(message_ids)
         logger.info(f"Beginne mit der Verarbeitung von {total_emails} E-Mails.")
 
-        for msg_id in message_ids:
-                logger.debug(f"Verarbeite E-Mail mit ID {msg_id.decode()}.")
+        # E-Mails blockweise abrufen (ein FETCH pro Block statt pro E-Mail) und
+        # blockweise verschieben (ein COPY/STORE/EXPUNGE pro Block statt pro E-Mail).
+        # Die IDs sind absteigend sortiert: Ein EXPUNGE verschiebt nur höhere Sequenznummern,
+        # die noch nicht abgerufenen (niedrigeren) IDs bleiben gültig.
+        pending_moves = []
+        for msg_id, raw_email, email_message in gmail_client.bulk_fetch(message_ids, batch_size=BATCH_SIZE):
+            msg_id_s = msg_id.decode() # Einmal pro E-Mail dekodieren; Logging formatiert nur bei aktivem Level
+            try:
+                logger.debug("Verarbeite E-Mail mit ID %s.", msg_id_s)
                 
                 # Anhänge speichern
-                if gmail_client.has_attachments(msg_id): # has_attachments kann GMAIL_LIB_EXCEPTION werfen
+                if gmail_client.has_attachments(msg_id, email_message=email_message):
                     try:
-                        gmail_client.save_attachments(msg_id, save_path)
-                        logger.info(f"Anhänge von E-Mail {msg_id.decode()} erfolgreich gespeichert.")
+                        gmail_client.save_attachments(msg_id, save_path, email_message=email_message)
+                        logger.info("Anhänge von E-Mail %s erfolgreich gespeichert.", msg_id_s)
                     except GMAIL_LIB_EXCEPTION as e:
-                        logger.warning(f"Konnte Anhänge von E-Mail {msg_id.decode()} nicht speichern: {e.message}")
+                        logger.warning("Konnte Anhänge von E-Mail %s nicht speichern: %s", msg_id_s, e.message)
                         # Dieser Fehler ist spezifisch für den Anhang; Prozess wird nicht abgebrochen.
                 else:
-                    logger.debug(f"E-Mail {msg_id.decode()} hat keine Anhänge.")
+                    logger.debug("E-Mail %s hat keine Anhänge.", msg_id_s)
 
-                gmail_client.save_email(msg_id, save_path)
-                logger.info(f"E-Mail {msg_id.decode()} erfolgreich gespeichert.")
+                gmail_client.save_email(msg_id, save_path, raw_email=raw_email, email_message=email_message)
+                logger.info("E-Mail %s erfolgreich gespeichert.", msg_id_s)
+            except GMAIL_LIB_EXCEPTION as e:
+                # Die E-Mail bleibt im Quellordner und wird beim nächsten Lauf erneut versucht
+                logger.error("Fehler bei der Verarbeitung von E-Mail %s: %s", msg_id_s, e.message, exc_info=True)
+                continue
+            except Exception as e:
+                logger.error("Unerwarteter Fehler bei der Verarbeitung von E-Mail %s: %s", msg_id_s, e, exc_info=True)
+                continue
 
-                gmail_client.move_object(msg_id, source_folder, target_folder)
-                processed_count += 1
-                logger.debug(f"E-Mail mit ID {msg_id.decode()} erfolgreich verarbeitet und verschoben.")
+            pending_moves.append(msg_id)
+            if len(pending_moves) >= BATCH_SIZE:
+                processed_count += _move_batch(gmail_client, pending_moves, source_folder, target_folder)
+                pending_moves = []
+
+        if pending_moves:
+            processed_count += _move_batch(gmail_client, pending_moves, source_folder, target_folder)
 
         final_message = f"{processed_count} von {total_emails} E-Mails erfolgreich verarbeitet und verschoben."
         success = True
         logger.info(final_message)
 
+    except _BatchMoveError as e:
+        failed = True
+        final_message = str(e)
+        logger.error(final_message, exc_info=True)
     except GMAIL_LIB_EXCEPTION as e:
-        final_message = f"Fehler bei der Verarbeitung von E-Mail {msg_id.decode()}: {e.message}"
-        # Dies fängt Fehler ab, die spezifisch für die aktuelle E-Mail-Verarbeitung sind
+        failed = True
+        # Fehler beim Login, bei Ordnerprüfung oder Abruf; Fehler einzelner E-Mails behandelt die Schleife
+        mid_s = msg_id.decode() if msg_id else "<vor der Schleife>"
+        final_message = f"Fehler bei der Verarbeitung von E-Mail {mid_s}: {e.message}"
         logger.error(final_message, exc_info=True)
-        # Hier wird der Fehler geloggt, aber die Schleife fährt mit der nächsten E-Mail fort.
     except Exception as e:
-        final_message = f"Unerwarteter Fehler bei der Verarbeitung von E-Mail {msg_id.decode()}: {e}"
+        failed = True
+        mid_s = msg_id.decode() if msg_id else "<vor der Schleife>"
+        final_message = f"Unerwarteter Fehler bei der Verarbeitung von E-Mail {mid_s}: {e}"
         logger.error(final_message, exc_info=True)
     finally:
-        # Sicherstellen, dass die Verbindung immer geschlossen wird, falls gmail_client erfolgreich instanziiert wurde
-        if gmail_client:
+        # Nach einem fehlerfreien Lauf bleibt die Verbindung für den nächsten Aufruf im Pool,
+        # nach einem Fehler wird sie geschlossen, falls gmail_client erfolgreich instanziiert wurde
+        if gmail_client and not failed and gmail_client.is_connected():
+            _checkin_client(user, password, gmail_client)
+        elif gmail_client:
             try:
                 gmail_client._logout() # Diese Methode wirft jetzt Exception bei Fehlschlag
             except GMAIL_LIB_EXCEPTION as e:
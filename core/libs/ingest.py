@@ -0,0 +1,54 @@
+# myproject/myapp/ingest.py
+
+"""
+Massenimport von Aktien und Empfehlungen (z.B. aus Analysten-Feeds).
+
+Statt eines save() pro Zeile werden die Objekte blockweise mit bulk_create geschrieben.
+bulk_create löst keine post_save-Signale aus; der Cache der Dashboard-Kennzahlen wird
+deshalb hier einmal pro Import verworfen.
+"""
+
+from django.db import transaction
+
+from ..models.stock_models import Stock, Recommendation
+from ..signals import PORTFOLIO_STATS_CACHE
+from .cache_lib import bump_cache_version
+
+INGEST_BATCH_SIZE = 1000
+
+# Felder, die beim Import einer bereits vorhandenen ISIN überschrieben werden
+STOCK_UPDATE_FIELDS = ['wkn', 'symbol', 'name', 'is_etf', 'currency', 'exchange', 'updated_at']
+
+
+def ingest_stocks(rows, batch_size=INGEST_BATCH_SIZE):
+    """
+    Legt Aktien aus einer Liste von Feld-Dicts an; vorhandene ISINs werden aktualisiert (Upsert).
+    Gibt die Zahl der geschriebenen Zeilen zurück.
+    """
+    objs = [Stock(**row) for row in rows]
+    if not objs:
+        return 0
+    with transaction.atomic():
+        Stock.objects.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['isin'],
+            update_fields=STOCK_UPDATE_FIELDS,
+        )
+    bump_cache_version(PORTFOLIO_STATS_CACHE)
+    return len(objs)
+
+
+def ingest_recommendations(rows, batch_size=INGEST_BATCH_SIZE):
+    """
+    Legt Empfehlungen aus einer Liste von Feld-Dicts an (z.B. mit stock_id statt stock).
+    Gibt die Zahl der angelegten Empfehlungen zurück.
+    """
+    objs = [Recommendation(**row) for row in rows]
+    if not objs:
+        return 0
+    with transaction.atomic():
+        Recommendation.objects.bulk_create(objs, batch_size=batch_size)
+    bump_cache_version(PORTFOLIO_STATS_CACHE)
+    return len(objs)
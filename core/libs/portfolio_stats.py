@@ -1,16 +1,57 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+
 from ..models.stock_models import Stock, Holdings, Alarm, Recommendation
-from django.db.models import F, Sum
+from ..signals import PORTFOLIO_STATS_CACHE
+from .cache_lib import get_cache_version
+
+STATS_CACHE_TIMEOUT = 30  # Sekunden; Änderungen invalidieren zusätzlich über die Signale
+
+# Gesamtwert auf die Nachkommastellen des Kaufpreises runden (SQLite liefert float-Rauschen)
+HOLDINGS_VALUE_QUANTUM = Decimal(1).scaleb(-Holdings._meta.get_field('average_purchase_price').decimal_places)
+
+
+def _column(model, field_name):
+    return connection.ops.quote_name(model._meta.get_field(field_name).column)
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
 
 def get_stats():
-    total_stocks = Stock.objects.count()
-    total_alarms = Alarm.objects.filter(is_active=True).count()
-    total_recom = Recommendation.objects.count()
-    holdings = Holdings.objects.aggregate(
-        total=Sum(F('quantity') * F('average_purchase_price'))
-    )['total']
+    """
+    Kennzahlen für das Dashboard, für STATS_CACHE_TIMEOUT Sekunden gecacht.
+    Speichern/Löschen von Aktien, Beständen, Alarmen oder Empfehlungen verwirft den Cache.
+    """
+    key = f"{PORTFOLIO_STATS_CACHE}:{get_cache_version(PORTFOLIO_STATS_CACHE)}"
+    return cache.get_or_set(key, _compute_stats, STATS_CACHE_TIMEOUT)
+
+
+def _compute_stats():
+    """
+    Alle vier Kennzahlen aus einer einzigen Abfrage mit skalaren Unterabfragen
+    (ein DB-Roundtrip statt vier).
+    """
+    sql = (
+        f"SELECT "
+        f"(SELECT COUNT(*) FROM {_table(Stock)}), "
+        f"(SELECT COUNT(*) FROM {_table(Alarm)} WHERE {_column(Alarm, 'is_active')} = %s), "
+        f"(SELECT COUNT(*) FROM {_table(Recommendation)}), "
+        f"(SELECT SUM({_column(Holdings, 'quantity')} * {_column(Holdings, 'average_purchase_price')}) FROM {_table(Holdings)})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [True])
+        total_stocks, total_alarms, total_recom, holdings = cursor.fetchone()
+    if holdings is not None:
+        if not isinstance(holdings, Decimal):
+            holdings = Decimal(str(holdings)) # SQLite liefert int/float statt Decimal
+        holdings = holdings.quantize(HOLDINGS_VALUE_QUANTUM)
     return {
         'total_stocks': total_stocks,
         'total_alarms': total_alarms or 0,
         'total_recommendations': total_recom,
         'total_holdings_value': holdings or 0
-    }
\ No newline at end of file
+    }
@@ -12,6 +12,7 @@ Parallels the GmailLib interface you already use:
 - has_attachments(msg_id)
 - save_attachments(msg_id, save_path)
 - save_message(msg_id, save_path)  # saves text
+- aget_message() / asave_attachments()  # async variants for concurrent processing
 
 Authentication modes supported:
 1) Device Code Flow (delegated user) — simplest for interactive use.
@@ -31,21 +32,48 @@ import logging
 import os
 import time
 import json
+import asyncio
+import base64
+import binascii
+import itertools
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # streamed reference downloads
+BASE64_CHUNK_SIZE = 4 << 20  # multiple of 4, so every slice of contentBytes decodes on its own
+ATTACHMENT_WORKERS = 8  # parallel attachment downloads per message
+ID_CACHE_TTL = 7 * 24 * 3600  # persisted name -> id mappings are re-resolved after a week (renames)
 AUTH_MSAL_AVAILABLE = True
 try:
     import msal  # type: ignore
 except Exception:  # pragma: no cover
     AUTH_MSAL_AVAILABLE = False
 
+# orjson (optional) parses the large paged Graph responses several times faster than stdlib json
+ORJSON_AVAILABLE = True
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    ORJSON_AVAILABLE = False
+
+# httpx powers the async variants (aget_message / asave_attachments)
+HTTPX_AVAILABLE = True
+try:
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover
+    HTTPX_AVAILABLE = False
+
 
 class ErrorType(Enum):
     AUTH = "AUTH"
@@ -64,6 +92,57 @@ class TEAMS_LIB_EXCEPTION(Exception):
         self.status = status
 
 
+def _json(resp) -> Dict:
+    """Decodes a Graph response body (requests or httpx response)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(resp.content)
+    return json.loads(resp.content)
+
+
+def _unique_attachment_names(attachments: List[Dict]) -> List[Tuple[Dict, str]]:
+    """Pairs each attachment with a file name; repeated names within a message get ' (2)', ' (3)', ... suffixes."""
+    seen: Dict[str, int] = {}
+    result = []
+    for att in attachments:
+        name = att.get("name") or "attachment"
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        if count > 1:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem} ({count}){ext}"
+        result.append((att, name))
+    return result
+
+
+def _part_path(path: str) -> str:
+    """Unique temporary path next to `path`; the finished file is moved into place with os.replace."""
+    return f"{path}.{uuid.uuid4().hex}.part"
+
+
+@contextmanager
+def _atomic_write(path: str, mode: str = "wb"):
+    """
+    Writes to a temporary file and renames it to `path` once complete, so concurrent writers
+    of the same target never interleave; the last finished file wins, as with plain overwrites.
+    """
+    tmp = _part_path(path)
+    try:
+        with open(tmp, mode.replace("w", "x"), **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _odata_quote(value: str) -> str:
+    """Escapes a value for use inside a single-quoted OData string literal."""
+    return value.replace("'", "''")
+
+
 @dataclass
 class AuthConfig:
     tenant_id: str
@@ -83,9 +162,22 @@ class TeamsLib:
     def __init__(self, auth: AuthConfig, session: Optional[requests.Session] = None):
         self.auth = auth
         self.session = session or requests.Session()
+        # Pooled keep-alive connections; 429/5xx retries (honouring Retry-After) happen in the adapter
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount("https://", adapter)
         self._access_token: Optional[str] = None
         self._cached_team_ids_by_name: Dict[str, str] = {}
         self._cached_channel_ids_by_name: Dict[Tuple[str, str], str] = {}
+        self._id_resolved_at: Dict[Tuple[str, ...], float] = {}  # cache key -> unix time of the Graph lookup
+        self._created_dirs: set = set()  # output directories already created by this instance
+        self._async_client = None  # httpx.AsyncClient, created lazily by the async methods
 
     # ---------------------- auth ----------------------
     def _login(self) -> None:
@@ -126,6 +218,9 @@ class TeamsLib:
                 ErrorType.AUTH,
             )
         self._access_token = result["access_token"]
+        self.session.headers["Authorization"] = f"Bearer {self._access_token}"
+        if self._async_client is not None:
+            self._async_client.headers["Authorization"] = self.session.headers["Authorization"]
         logger.debug("TeamsLib: login successful.")
 
     def _logout(self) -> None:
@@ -133,25 +228,53 @@ class TeamsLib:
         logger.debug("TeamsLib: logout (noop).")
 
     # ---------------------- helpers ----------------------
-    def _headers(self) -> Dict[str, str]:
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
         if not self._access_token:
             raise TEAMS_LIB_EXCEPTION("Not authenticated", ErrorType.AUTH)
-        return {"Authorization": f"Bearer {self._access_token}"}
+        # Authorization is set on the session in _login; retries are done by the mounted HTTPAdapter
+        resp = self.session.request(method, url, timeout=60, **kwargs)
+        if resp.status_code == 429 or 500 <= resp.status_code < 600:
+            raise TEAMS_LIB_EXCEPTION("Exceeded retries for Graph API call", ErrorType.RATE_LIMIT, status=resp.status_code)
+        if not resp.ok:
+            raise TEAMS_LIB_EXCEPTION(
+                f"Graph API error {resp.status_code}: {resp.text[:500]}", ErrorType.API, status=resp.status_code
+            )
+        return resp
 
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+    # ---------------------- async helpers ----------------------
+    def _get_async_client(self):
+        if not HTTPX_AVAILABLE:
+            raise TEAMS_LIB_EXCEPTION("httpx package is not installed. pip install httpx", ErrorType.UNKNOWN)
+        if not self._access_token:
+            raise TEAMS_LIB_EXCEPTION("Not authenticated", ErrorType.AUTH)
+        if self._async_client is None:
+            # Same default Authorization header as the requests session (set in _login)
+            self._async_client = httpx.AsyncClient(
+                timeout=60, follow_redirects=True, headers={"Authorization": f"Bearer {self._access_token}"}
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Closes the shared async HTTP client (call once the event loop work is done)."""
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.aclose()
+
+    async def _arequest(self, method: str, url: str, **kwargs):
+        """Async counterpart of _request with the same 429/5xx retry behaviour."""
+        client = self._get_async_client()
         for attempt in range(5):
-            resp = self.session.request(method, url, headers=self._headers(), timeout=60, **kwargs)
+            resp = await client.request(method, url, **kwargs)
             if resp.status_code == 429:
-                # Rate limit: respect Retry-After
                 retry_after = int(resp.headers.get("Retry-After", "2"))
                 logger.warning("Graph 429 rate limited. Sleeping %s seconds (attempt %s)", retry_after, attempt + 1)
-                time.sleep(retry_after)
+                await asyncio.sleep(retry_after)
                 continue
             if 500 <= resp.status_code < 600:
                 logger.warning("Graph %s error. Retrying (attempt %s)", resp.status_code, attempt + 1)
-                time.sleep(1 + attempt)
+                await asyncio.sleep(1 + attempt)
                 continue
-            if not resp.ok:
+            if not resp.is_success:
                 raise TEAMS_LIB_EXCEPTION(
                     f"Graph API error {resp.status_code}: {resp.text[:500]}", ErrorType.API, status=resp.status_code
                 )
@@ -159,23 +282,62 @@ class TeamsLib:
         raise TEAMS_LIB_EXCEPTION("Exceeded retries for Graph API call", ErrorType.RATE_LIMIT)
 
     # ---------------------- IDs lookup ----------------------
-    def get_team_id_by_name(self, team_display_name: str) -> str:
-        if team_display_name in self._cached_team_ids_by_name:
-            return self._cached_team_ids_by_name[team_display_name]
-        url = f"{GRAPH_BASE}/me/joinedTeams" if self.auth.use_device_code else f"{GRAPH_BASE}/teams"
-        # Filter by displayName (client-side due to Graph restrictions on application endpoint)
-        teams: List[Dict] = []
+    def _iter_pages(self, url: str, params: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yields the items of a paged Graph listing; the next page is only requested once needed."""
         next_url = url
         while next_url:
-            resp = self._request("GET", next_url)
-            data = resp.json()
-            teams.extend(data.get("value", []))
+            resp = self._request("GET", next_url, params=params)
+            params = None  # @odata.nextLink already carries the query
+            data = _json(resp)
+            yield from data.get("value", [])
             next_url = data.get("@odata.nextLink")
+
+    def _get_all_pages(self, url: str, params: Optional[Dict] = None) -> List[Dict]:
+        return list(self._iter_pages(url, params=params))
+
+    def _list_by_display_name(self, url: str, display_name: str, fallbacks: List[Tuple[str, Dict]]) -> List[Dict]:
+        """Lists items at url filtered server-side by displayName.
+
+        Some endpoints reject $filter (400, e.g. /me/joinedTeams for many tenants) or the
+        fallback needs a permission the caller lacks (403); the next entry of fallbacks
+        (url, params) is tried then. The last resort is the unfiltered listing of url.
+        """
+        attempts = [(url, {"$filter": f"displayName eq '{_odata_quote(display_name)}'"})] + fallbacks
+        for attempt_url, params in attempts:
+            try:
+                return self._get_all_pages(attempt_url, params=params)
+            except TEAMS_LIB_EXCEPTION as e:
+                if e.status not in (400, 403):
+                    raise
+                logger.info("Graph rejected filtered lookup on %s (%s); trying next option", attempt_url, e.status)
+        return self._get_all_pages(url)
+
+    def get_team_id_by_name(self, team_display_name: str) -> str:
+        if team_display_name in self._cached_team_ids_by_name:
+            return self._cached_team_ids_by_name[team_display_name]
+        if self.auth.use_device_code:
+            # Delegated: only joined teams are readable. /groups would list every team in the tenant,
+            # so the fallback for a rejected $filter is the unfiltered /me/joinedTeams listing.
+            teams = self._list_by_display_name(f"{GRAPH_BASE}/me/joinedTeams", team_display_name, [])
+        else:
+            # Application: /teams already spans the tenant; every team is backed by a group,
+            # so /groups is an equivalent source that always supports $filter
+            groups_filter = (
+                "resourceProvisioningOptions/Any(x:x eq 'Team') and "
+                f"displayName eq '{_odata_quote(team_display_name)}'"
+            )
+            teams = self._list_by_display_name(
+                f"{GRAPH_BASE}/teams",
+                team_display_name,
+                [(f"{GRAPH_BASE}/groups", {"$filter": groups_filter, "$select": "id,displayName"})],
+            )
+        # displayName eq is case-insensitive in Graph, keep the exact match semantics
         for t in teams:
             if t.get("displayName") == team_display_name:
                 team_id = t.get("id")
                 if team_id:
                     self._cached_team_ids_by_name[team_display_name] = team_id
+                    self._id_resolved_at[("team", team_display_name)] = time.time()
                     return team_id
         raise TEAMS_LIB_EXCEPTION(f"Team '{team_display_name}' not found", ErrorType.NOT_FOUND)
 
@@ -183,19 +345,13 @@ class TeamsLib:
         cache_key = (team_id, channel_display_name)
         if cache_key in self._cached_channel_ids_by_name:
             return self._cached_channel_ids_by_name[cache_key]
-        url = f"{GRAPH_BASE}/teams/{team_id}/channels"
-        channels: List[Dict] = []
-        next_url = url
-        while next_url:
-            resp = self._request("GET", next_url)
-            data = resp.json()
-            channels.extend(data.get("value", []))
-            next_url = data.get("@odata.nextLink")
+        channels = self._list_by_display_name(f"{GRAPH_BASE}/teams/{team_id}/channels", channel_display_name, [])
         for c in channels:
             if c.get("displayName") == channel_display_name:
                 channel_id = c.get("id")
                 if channel_id:
                     self._cached_channel_ids_by_name[cache_key] = channel_id
+                    self._id_resolved_at[("channel",) + cache_key] = time.time()
                     return channel_id
         raise TEAMS_LIB_EXCEPTION(f"Channel '{channel_display_name}' not found in team {team_id}", ErrorType.NOT_FOUND)
 
@@ -210,33 +366,65 @@ class TeamsLib:
                 return False
             raise
 
-    def get_message_ids_in_channel(self, team_id: str, channel_id: str) -> List[str]:
-        """Returns a list of message IDs (root messages only)."""
-        url = f"{GRAPH_BASE}/teams/{team_id}/channels/{channel_id}/messages?$top=50"
-        msg_ids: List[str] = []
-        next_url = url
-        while next_url:
-            resp = self._request("GET", next_url)
-            data = resp.json()
-            for m in data.get("value", []):
-                if m.get("messageType") == "message":
-                    if m.get("id"):
-                        msg_ids.append(m["id"])
-            next_url = data.get("@odata.nextLink")
-        return msg_ids
+    def iter_message_ids_in_channel(
+        self, team_id: str, channel_id: str, return_full: bool = False, since: Optional[str] = None
+    ) -> Iterator:
+        """Yields message IDs (root messages only) page by page, so callers can start processing
+        before the last page has arrived and only hold one page in memory.
+
+        With return_full=True, yields (id, message) tuples instead: the paged listing already
+        contains the full message payloads, so no follow-up get_message() call is needed.
+
+        With since (ISO 8601 timestamp, e.g. the newest lastModifiedDateTime of a previous run),
+        only messages created or changed after it are listed. The plain listing supports neither
+        $filter nor $orderby, so this goes through the delta endpoint, which does.
+        """
+        base = f"{GRAPH_BASE}/teams/{team_id}/channels/{channel_id}/messages"
+        items: Iterator[Dict] = self._iter_pages(f"{base}?$top=50")
+        if since:
+            delta = self._iter_pages(f"{base}/delta", params={"$filter": f"lastModifiedDateTime gt {since}"})
+            try:
+                first = next(delta, None)  # a rejected query fails on the first page
+            except TEAMS_LIB_EXCEPTION as e:
+                if e.status != 400:
+                    raise
+                logger.warning("Delta query rejected for channel %s (%s); listing all messages", channel_id, e.status)
+            else:
+                items = delta if first is None else itertools.chain([first], delta)
+        for m in items:
+            if m.get("messageType") == "message":
+                if m.get("id"):
+                    yield (m["id"], m) if return_full else m["id"]
+
+    def get_message_ids_in_channel(
+        self, team_id: str, channel_id: str, return_full: bool = False, since: Optional[str] = None
+    ) -> List:
+        """Returns a list of message IDs (root messages only); see iter_message_ids_in_channel."""
+        return list(self.iter_message_ids_in_channel(team_id, channel_id, return_full=return_full, since=since))
 
     def get_message(self, team_id: str, channel_id: str, message_id: str) -> Dict:
         url = f"{GRAPH_BASE}/teams/{team_id}/channels/{channel_id}/messages/{message_id}"
         resp = self._request("GET", url)
-        return resp.json()
+        return _json(resp)
+
+    async def aget_message(self, team_id: str, channel_id: str, message_id: str) -> Dict:
+        url = f"{GRAPH_BASE}/teams/{team_id}/channels/{channel_id}/messages/{message_id}"
+        resp = await self._arequest("GET", url)
+        return _json(resp)
 
     def has_attachments(self, message: Dict) -> bool:
         attachments = message.get("attachments", [])
         return bool(attachments)
 
     # ---------------------- saving ----------------------
+    def _ensure_dir(self, path: str) -> None:
+        """os.makedirs once per directory and instance; later calls skip the syscall."""
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+
     def save_message(self, message: Dict, save_path: str) -> None:
-        os.makedirs(os.path.join(save_path, "E-Mails"), exist_ok=True)  # keeping folder names consistent with Gmail side
+        self._ensure_dir(os.path.join(save_path, "E-Mails"))  # keeping folder names consistent with Gmail side
         msg_id = message.get("id", "unknown")
         created = message.get("createdDateTime", "")
         from_user = (message.get("from", {}) or {}).get("user", {}) or {}
@@ -245,40 +433,108 @@ class TeamsLib:
         content = (message.get("body", {}) or {}).get("content") or ""
         filename = f"{created.replace(':', '-')}_{msg_id}.txt"
         full_path = os.path.join(save_path, "E-Mails", filename)
+        text = (
+            f"Author: {author}\n"
+            f"Created: {created}\n"
+            + (f"Subject: {subject}\n" if subject else "")
+            + f"\n--- MESSAGE BODY (HTML or text) ---\n\n{content}"
+        )
         try:
             with open(full_path, "w", encoding="utf-8") as f:
-                f.write(f"Author: {author}\n")
-                f.write(f"Created: {created}\n")
-                if subject:
-                    f.write(f"Subject: {subject}\n")
-                f.write("\n--- MESSAGE BODY (HTML or text) ---\n\n")
-                f.write(content)
+                f.write(text)  # one write per file instead of one per header line
             logger.debug("Saved message %s to %s", msg_id, full_path)
         except OSError as e:
             raise TEAMS_LIB_EXCEPTION(f"Failed to write message file: {e}", ErrorType.IO)
 
     def save_attachments(self, message: Dict, save_path: str) -> None:
-        os.makedirs(os.path.join(save_path, "Anlagen"), exist_ok=True)
+        self._ensure_dir(os.path.join(save_path, "Anlagen"))
+        msg_id = message.get("id", "unknown")
+        attachments = message.get("attachments", []) or []
+
+        named = _unique_attachment_names(attachments)  # same-named attachments must not share a target path
+
+        def _save(item: Tuple[Dict, str]) -> None:
+            att, name = item
+            try:
+                self._download_attachment(att, save_path, name)
+            except TEAMS_LIB_EXCEPTION as e:
+                logger.warning("Could not download attachment for message %s: %s", msg_id, e.message)
+
+        if len(named) <= 1:
+            for item in named:
+                _save(item)
+            return
+        # Reference downloads are blocking GETs; run them side by side (the session pool allows 64 connections)
+        with ThreadPoolExecutor(max_workers=min(ATTACHMENT_WORKERS, len(named))) as executor:
+            list(executor.map(_save, named))
+
+    async def asave_attachments(self, message: Dict, save_path: str) -> None:
+        """Async counterpart of save_attachments; reference downloads run on the shared async client."""
+        self._ensure_dir(os.path.join(save_path, "Anlagen"))
         msg_id = message.get("id", "unknown")
         attachments = message.get("attachments", []) or []
-        for att in attachments:
+
+        async def _save(att: Dict, name: str) -> None:
             try:
-                self._download_attachment(att, save_path)
+                await self._adownload_attachment(att, save_path, name)
             except TEAMS_LIB_EXCEPTION as e:
                 logger.warning("Could not download attachment for message %s: %s", msg_id, e.message)
 
-    def _download_attachment(self, att: Dict, save_path: str) -> None:
+        await asyncio.gather(*(_save(att, name) for att, name in _unique_attachment_names(attachments)))
+
+    async def _adownload_attachment(self, att: Dict, save_path: str, name: Optional[str] = None) -> None:
+        # Base64 decoding and file I/O run in worker threads so they don't block the event loop
+        if att.get("@odata.type") != "#microsoft.graph.referenceAttachment":
+            # fileAttachments carry their content inline, nothing to download
+            await asyncio.to_thread(self._download_attachment, att, save_path, name)
+            return
+        name = name or att.get("name") or "attachment"
+        url = att.get("previewUrl") or att.get("sourceUrl")
+        if not url:
+            raise TEAMS_LIB_EXCEPTION("referenceAttachment missing URL", ErrorType.API)
+        async with self._get_async_client().stream("GET", url) as resp:
+            if resp.status_code == 200:
+                path = os.path.join(save_path, "Anlagen", name)
+                tmp = _part_path(path)  # same scheme as _atomic_write, with the I/O in worker threads
+                f = await asyncio.to_thread(open, tmp, "xb")
+                try:
+                    async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+                    await asyncio.to_thread(f.close)
+                    await asyncio.to_thread(os.replace, tmp, path)
+                except BaseException:
+                    f.close()
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    raise
+                logger.debug("Saved referenceAttachment to %s", path)
+            else:
+                await asyncio.to_thread(self._store_reference_pointer, name, url, resp.status_code, save_path)
+
+    def _store_reference_pointer(self, name: str, url: str, status_code: int, save_path: str) -> None:
+        # Fallback: store a .url pointer file
+        pointer = os.path.join(save_path, "Anlagen", f"{name}.url.txt")
+        with _atomic_write(pointer, "w") as f:
+            f.write(url)
+        logger.info("Stored reference URL for attachment at %s (HTTP %s)", pointer, status_code)
+
+    def _download_attachment(self, att: Dict, save_path: str, name: Optional[str] = None) -> None:
         atype = att.get("@odata.type")
-        name = att.get("name") or "attachment"
+        name = name or att.get("name") or "attachment"
         if atype == "#microsoft.graph.fileAttachment":
             content_bytes = att.get("contentBytes")
             if not content_bytes:
                 raise TEAMS_LIB_EXCEPTION("Empty fileAttachment content", ErrorType.API)
-            import base64
-            data = base64.b64decode(content_bytes)
             path = os.path.join(save_path, "Anlagen", name)
-            with open(path, "wb") as f:
-                f.write(data)
+            try:
+                with _atomic_write(path) as f:
+                    # Decode in 4-aligned slices so only one chunk of decoded bytes is alive at a time
+                    for i in range(0, len(content_bytes), BASE64_CHUNK_SIZE):
+                        f.write(base64.b64decode(content_bytes[i:i + BASE64_CHUNK_SIZE]))
+            except binascii.Error as e:
+                raise TEAMS_LIB_EXCEPTION(f"Invalid fileAttachment content: {e}", ErrorType.API)
             logger.debug("Saved fileAttachment to %s", path)
         elif atype == "#microsoft.graph.referenceAttachment":
             # Reference to a SharePoint/OneDrive file — try to resolve and download original if permitted
@@ -286,33 +542,59 @@ class TeamsLib:
             if not url:
                 raise TEAMS_LIB_EXCEPTION("referenceAttachment missing URL", ErrorType.API)
             # In many cases these URLs require auth; try session with bearer
-            resp = self.session.get(url, headers=self._headers(), timeout=60)
-            if resp.status_code == 200:
-                path = os.path.join(save_path, "Anlagen", name)
-                with open(path, "wb") as f:
-                    f.write(resp.content)
-                logger.debug("Saved referenceAttachment to %s", path)
-            else:
-                # Fallback: store a .url pointer file
-                pointer = os.path.join(save_path, "Anlagen", f"{name}.url.txt")
-                with open(pointer, "w", encoding="utf-8") as f:
-                    f.write(url)
-                logger.info("Stored reference URL for attachment at %s (HTTP %s)", pointer, resp.status_code)
+            with self.session.get(url, timeout=60, stream=True) as resp:
+                if resp.status_code == 200:
+                    path = os.path.join(save_path, "Anlagen", name)
+                    with _atomic_write(path) as f:
+                        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    logger.debug("Saved referenceAttachment to %s", path)
+                else:
+                    self._store_reference_pointer(name, url, resp.status_code, save_path)
         else:
             raise TEAMS_LIB_EXCEPTION(f"Unsupported attachment type: {atype}", ErrorType.API)
 
     # ---------------------- checkpoint (local) ----------------------
     def load_checkpoint(self, save_path: str) -> Dict:
+        """Loads the checkpoint and primes the team/channel id caches from its non-expired entries."""
         path = os.path.join(save_path, ".teams_checkpoint.json")
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+            self._load_id_cache(data)
+            return data
         return {}
 
     def save_checkpoint(self, save_path: str, data: Dict) -> None:
+        """Writes the checkpoint, including the resolved team/channel ids for the next run."""
+        data["team_ids"], data["channel_ids"] = self._dump_id_cache()
         path = os.path.join(save_path, ".teams_checkpoint.json")
+        if ORJSON_AVAILABLE:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
 
-
-
+    def _load_id_cache(self, data: Dict) -> None:
+        now = time.time()
+        for name, entry in (data.get("team_ids") or {}).items():
+            if now - entry.get("resolved_at", 0) < ID_CACHE_TTL and entry.get("id"):
+                self._cached_team_ids_by_name.setdefault(name, entry["id"])
+                self._id_resolved_at.setdefault(("team", name), entry["resolved_at"])
+        for team_id, channels in (data.get("channel_ids") or {}).items():
+            for name, entry in channels.items():
+                if now - entry.get("resolved_at", 0) < ID_CACHE_TTL and entry.get("id"):
+                    self._cached_channel_ids_by_name.setdefault((team_id, name), entry["id"])
+                    self._id_resolved_at.setdefault(("channel", team_id, name), entry["resolved_at"])
+
+    def _dump_id_cache(self) -> Tuple[Dict, Dict]:
+        team_ids = {
+            name: {"id": team_id, "resolved_at": self._id_resolved_at.get(("team", name), time.time())}
+            for name, team_id in self._cached_team_ids_by_name.items()
+        }
+        channel_ids: Dict[str, Dict] = {}
+        for (team_id, name), channel_id in self._cached_channel_ids_by_name.items():
+            resolved_at = self._id_resolved_at.get(("channel", team_id, name), time.time())
+            channel_ids.setdefault(team_id, {})[name] = {"id": channel_id, "resolved_at": resolved_at}
+        return team_ids, channel_ids
@@ -1,11 +1,112 @@
 from __future__ import annotations
+import asyncio
 import logging
-from typing import Tuple
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, Set, Tuple
 
 from .teams_lib import TeamsLib, TEAMS_LIB_EXCEPTION, AuthConfig
 
 logger = logging.getLogger(__name__)
 
+# Team ids are GUIDs; channel ids look like "19:<token>@thread.tacv2" (or "@thread.skype")
+_GUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_CHANNEL_ID_RE = re.compile(r"^19:[^@\s]+@thread\.[\w.]+$")
+
+# Maximum number of messages fetched/saved concurrently (Graph throttles with 429 beyond that)
+DEFAULT_CONCURRENCY = 8
+
+_DONE = object()  # end-of-stream marker for the message queue
+
+
+@dataclass
+class _RunStats:
+    total: int = 0
+    processed: int = 0
+    failed: bool = False
+    newest: str = ""
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.processed += 1
+        else:
+            self.failed = True
+
+
+def _unprocessed(items: Iterator[Tuple[str, Dict]], processed_ids: Set[str], stats: _RunStats) -> Iterator[Tuple[str, Dict]]:
+    """Counts every listed message, tracks the newest timestamp and skips already processed ids."""
+    for mid, msg in items:
+        stats.total += 1
+        stats.newest = max(stats.newest, msg.get("lastModifiedDateTime") or msg.get("createdDateTime") or "")
+        if mid in processed_ids:
+            logger.debug("Überspringe bereits verarbeitete Nachricht %s", mid)
+            continue
+        yield mid, msg
+
+
+def _process_message(client: TeamsLib, mid: str, msg: Dict, save_path: str, processed_ids: Set[str]) -> bool:
+    """Saves one message and its attachments (shared by both paths); returns False on failure, never raises."""
+    try:
+        if client.has_attachments(msg):
+            try:
+                client.save_attachments(msg, save_path)
+                logger.info("Anhänge zu Nachricht %s gespeichert.", mid)
+            except TEAMS_LIB_EXCEPTION as e:
+                logger.warning("Konnte Anhänge zu %s nicht speichern: %s", mid, e.message)
+        else:
+            logger.debug("Nachricht %s hat keine Anhänge.", mid)
+
+        client.save_message(msg, save_path)
+        logger.info("Nachricht %s gespeichert.", mid)
+    except TEAMS_LIB_EXCEPTION as e:
+        logger.error("Fehler bei Nachricht %s: %s", mid, e.message, exc_info=True)
+        return False
+    except Exception as e:  # pragma: no cover
+        logger.error("Unerwarteter Fehler bei Nachricht %s: %s", mid, e, exc_info=True)
+        return False
+    processed_ids.add(mid)  # set.add is atomic, also when called from a worker thread
+    return True
+
+
+async def _aprocess_messages(
+    client: TeamsLib,
+    messages: Iterator[Tuple[str, Dict]],
+    save_path: str,
+    processed_ids: Set[str],
+    concurrency: int,
+    stats: _RunStats,
+) -> None:
+    """
+    Processes (id, message) pairs with `concurrency` workers while the listing is still paging.
+    The blocking page iterator is advanced in a worker thread and feeds a bounded queue,
+    so only about one page of messages is held in memory at a time.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+
+    async def _produce() -> None:
+        try:
+            while (item := await asyncio.to_thread(next, messages, _DONE)) is not _DONE:
+                await queue.put(item)
+        finally:
+            for _ in range(concurrency):
+                await queue.put(_DONE)
+
+    async def _consume() -> None:
+        while (item := await queue.get()) is not _DONE:
+            mid, msg = item
+            # Saving is blocking file and HTTP I/O; each worker runs it in its own thread
+            ok = await asyncio.to_thread(_process_message, client, mid, msg, save_path, processed_ids)
+            stats.record(ok)  # counters are only updated on the event loop thread
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_produce())
+            for _ in range(concurrency):
+                tg.create_task(_consume())
+    except ExceptionGroup as eg:
+        # Only the producer can fail (paging errors); re-raise it as the sequential path would
+        raise eg.exceptions[0]
+
 
 def run_channel_automation(
     tenant_id: str,
@@ -15,6 +116,7 @@ def run_channel_automation(
     channel_name_or_id: str,
     save_path: str,
     use_device_code: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> Tuple[bool, str]:
     """
     Extracts all root messages (and their attachments) from the given Teams channel
@@ -27,6 +129,7 @@ def run_channel_automation(
     channel_name_or_id : Either the display name of the Channel or its GUID
     save_path : base directory where 'E-Mails/' and 'Anlagen/' will be created
     use_device_code : toggle between delegated (True) and application flow (False)
+    concurrency : number of messages processed in parallel (1 = sequential)
     """
     logger.debug("run_channel_automation (Teams Orchestrator) started.")
 
@@ -47,14 +150,18 @@ def run_channel_automation(
         client._login()
         logger.debug("Teams login successful.")
 
+        # Load checkpoint first: it holds the processed message ids and previously resolved team/channel ids
+        checkpoint = client.load_checkpoint(save_path)
+        processed_ids = set(checkpoint.get("processed_ids", []))
+
         # Resolve IDs if names were provided
-        if team_name_or_id.count("-") == 4:  # naive GUID check
+        if _GUID_RE.match(team_name_or_id):
             team_id = team_name_or_id
         else:
             logger.debug("Resolving team id by name: %s", team_name_or_id)
             team_id = client.get_team_id_by_name(team_name_or_id)
 
-        if channel_name_or_id.count("-") == 4:
+        if _CHANNEL_ID_RE.match(channel_name_or_id) or _GUID_RE.match(channel_name_or_id):
             channel_id = channel_name_or_id
         else:
             logger.debug("Resolving channel id by name: %s", channel_name_or_id)
@@ -65,49 +172,40 @@ def run_channel_automation(
             logger.error("Channel '%s' not found in Team '%s'", channel_name_or_id, team_name_or_id)
             return False, f"Fehler: Kanal '{channel_name_or_id}' existiert nicht im Team '{team_name_or_id}'."
 
-        # Load checkpoint (last processed message ids)
-        checkpoint = client.load_checkpoint(save_path)
-        processed_ids = set(checkpoint.get("processed_ids", []))
+        logger.debug("Fetching messages from channel.")
+        # The listing already carries the full payloads; no per-message GET needed
+        # Only messages changed since the last complete run of this channel (per-channel watermark)
+        since_by_channel = checkpoint.setdefault("messages_since", {})
+        since = since_by_channel.get(channel_id)
+        run_async = concurrency > 1
+
+        stats = _RunStats(newest=since or "")
+        # Pages are consumed as they arrive; both paths save messages while the listing is still paging
+        messages = _unprocessed(
+            client.iter_message_ids_in_channel(team_id, channel_id, return_full=True, since=since),
+            processed_ids,
+            stats,
+        )
+        if run_async:
+            asyncio.run(_aprocess_messages(client, messages, save_path, processed_ids, concurrency, stats))
+        else:
+            for mid, msg in messages:
+                stats.record(_process_message(client, mid, msg, save_path, processed_ids))
 
-        logger.debug("Fetching message ids from channel.")
-        message_ids = client.get_message_ids_in_channel(team_id, channel_id)
-        if not message_ids:
+        if not stats.total:
+            # Also persist on idle runs: it carries the freshly resolved team/channel ids
+            client.save_checkpoint(save_path, checkpoint)
             logger.info("Keine neuen Nachrichten im Kanal gefunden.")
             return True, "Keine neuen Nachrichten im Kanal gefunden."
 
-        total = len(message_ids)
-        processed = 0
-        logger.info("Beginne mit der Verarbeitung von %s Nachrichten.", total)
-
-        for mid in message_ids:
-            if mid in processed_ids:
-                logger.debug("Überspringe bereits verarbeitete Nachricht %s", mid)
-                continue
-            try:
-                msg = client.get_message(team_id, channel_id, mid)
-                if client.has_attachments(msg):
-                    try:
-                        client.save_attachments(msg, save_path)
-                        logger.info("Anhänge zu Nachricht %s gespeichert.", mid)
-                    except TEAMS_LIB_EXCEPTION as e:
-                        logger.warning("Konnte Anhänge zu %s nicht speichern: %s", mid, e.message)
-                else:
-                    logger.debug("Nachricht %s hat keine Anhänge.", mid)
-
-                client.save_message(msg, save_path)
-                logger.info("Nachricht %s gespeichert.", mid)
-
-                processed += 1
-                processed_ids.add(mid)
-            except TEAMS_LIB_EXCEPTION as e:
-                logger.error("Fehler bei Nachricht %s: %s", mid, e.message, exc_info=True)
-            except Exception as e:  # pragma: no cover
-                logger.error("Unerwarteter Fehler bei Nachricht %s: %s", mid, e, exc_info=True)
+        # Advance the watermark only if nothing failed; failed messages must be listed again next run
+        if not stats.failed and stats.newest:
+            since_by_channel[channel_id] = stats.newest
 
         checkpoint["processed_ids"] = list(processed_ids)
         client.save_checkpoint(save_path, checkpoint)
 
-        final_message = f"{processed} von {total} Nachrichten verarbeitet."
+        final_message = f"{stats.processed} von {stats.total} Nachrichten verarbeitet."
         success = True
         logger.info(final_message)
 
@@ -1,26 +1,34 @@
 # 🔹 OpenAI LLM
 import openai
 from .base_llm import LLMBase
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
+import datetime
 import json
+import time
 import requests
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+BALANCE_CACHE_TTL = 300 # seconds; billing data changes slowly
+
 class OpenAILLM(LLMBase):
     def __init__(self, api_key: str, model: str = "gpt-4o", url: str = "https://api.openai.com/v1"):
         self.api_key = api_key
         self.model = model
         self.client = openai.OpenAI(api_key=api_key)
         self.url = url
+        # One session for the billing calls: both requests share the same HTTPS connection
+        self._billing_session = requests.Session()
+        self._billing_session.headers["Authorization"] = f"Bearer {api_key}"
+        self._balance_cache = None # (timestamp, result)
 
     def query_ai(self, prompt: str, temperature=0.0, content="", model=None) -> str:
         if model is None:
             model = self.model
         try:
-            logger.debug(f"🔍 Querying OpenAI with model: {model}, temperature: {temperature}, content: {content}, prompt: {prompt}")
+            logger.debug("🔍 Querying OpenAI with model: %s, temperature: %s, content: %s, prompt: %s", model, temperature, content, prompt)
             response = self.client.chat.completions.create(
                 model=model,
                 messages=[
@@ -30,8 +38,8 @@ class OpenAILLM(LLMBase):
                 temperature=temperature
             )
             logger.debug("✅ DEBUG: Back in Query Function")
-            logger.debug(f"✅ DEBUG: OpenAI raw response: {response}")
-            logger.debug(f"Nach response")  
+            logger.debug("✅ DEBUG: OpenAI raw response: %s", response)
+            logger.debug("Nach response")  
             if (
                 response
                 and hasattr(response, "choices")
@@ -41,55 +49,78 @@ class OpenAILLM(LLMBase):
             ):
                 return response.choices[0].message.content.strip()
     
-            logger.error(f"⚠️ Unexpected OpenAI response format: {response}")
+            logger.error("⚠️ Unexpected OpenAI response format: %s", response)
             return ""
         except Exception as e:
             logger.error(f"❌ Error querying OpenAI: {e}")
             return ""
 
 
+    def stream_ai(self, prompt: str, temperature=0.0, content="", model=None) -> Iterator[str]:
+        """Like query_ai, but yields the answer piece by piece as OpenAI produces it. Raises on API errors."""
+        if model is None:
+            model = self.model
+        logger.debug("🔍 Streaming from OpenAI with model: %s, temperature: %s", model, temperature)
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": content},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def extract_json(self, prompt: str) -> Dict[str, Any]:
-        response = self.query_ai(
-            prompt = prompt,
-            temperature = 0.0,
-            content = "Extract structured financial data in JSON format. Include currency if given, otherwise assume EUR.")
-        content = response.choices[0].message.content
+        # JSON mode: the API only returns a JSON object, no ```json fences to strip
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "Extract structured financial data in JSON format. Include currency if given, otherwise assume EUR."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.0,
+                response_format={"type": "json_object"}
+            )
+            content = response.choices[0].message.content
+        except Exception as e:
+            logger.error(f"❌ Error querying OpenAI: {e}")
+            return {"error": str(e)}
         try:
-            content_clean = content.strip()
-            if content_clean.startswith("```json"):
-                content_clean = content_clean.replace("```json", "").replace("```", "").strip()
-            return json.loads(content_clean)
-        except json.JSONDecodeError:
+            return json.loads(content)
+        except (json.JSONDecodeError, TypeError):
+            # e.g. truncated output when max tokens are reached
             return {"error": "Failed to parse JSON", "raw_output": content}
         
-    def get_account_balance(self) -> Dict[str, Any]:
-        """Fetch current OpenAI account balance and usage."""
+    def get_account_balance(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Fetch current OpenAI account balance and usage (cached for BALANCE_CACHE_TTL seconds unless force_refresh)."""
+        if not force_refresh and self._balance_cache and time.monotonic() - self._balance_cache[0] < BALANCE_CACHE_TTL:
+            return self._balance_cache[1]
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}"
-            }
-
             # 1. Check subscription
-            sub_resp = requests.get(
+            sub_resp = self._billing_session.get(
                 self.url+"/dashboard/billing/subscription",
-                headers=headers,
                 timeout=10
             )
             sub_data = sub_resp.json()
 
             # 2. Check usage (current billing cycle)
-            usage_resp = requests.get(
+            today = datetime.date.today()
+            usage_resp = self._billing_session.get(
                 self.url+"/dashboard/billing/usage",
-                headers=headers,
                 timeout=10,
                 params={
-                    "start_date": "2025-07-01",  # Use current month start
-                    "end_date": "2025-07-31"     # Replace with today's date
+                    "start_date": today.replace(day=1).isoformat(),  # Current month start
+                    "end_date": (today + datetime.timedelta(days=1)).isoformat()  # end_date is exclusive, include today
                 }
             )
             usage_data = usage_resp.json()
 
-            return {
+            balance = {
                 "hard_limit_usd": sub_data.get("hard_limit_usd"),
                 "used_usd": round(usage_data.get("total_usage", 0) / 100.0, 2),
                 "remaining_usd": round(
@@ -97,6 +128,8 @@ class OpenAILLM(LLMBase):
                     2
                 )
             }
+            self._balance_cache = (time.monotonic(), balance) # errors are not cached
+            return balance
 
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
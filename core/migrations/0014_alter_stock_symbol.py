@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-14 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_alter_savingplan_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stock',
+            name='symbol',
+            field=models.CharField(blank=True, db_index=True, help_text='Börsenkürzel (z.B. AAPL, SAP)', max_length=10, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-14 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_alter_stock_symbol'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alarm',
+            index=models.Index(fields=['-created_at'], name='core_alarm_created_6d4aca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='holdings',
+            index=models.Index(fields=['-quantity'], name='core_holdin_quantit_9a1dba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['-publication_date'], name='core_recomm_publica_3ffc41_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['stock', 'is_valid', '-publication_date'], name='core_recomm_stock_i_38fd2c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(fields=['name'], name='core_stock_name_42e6c6_idx'),
+        ),
+    ]
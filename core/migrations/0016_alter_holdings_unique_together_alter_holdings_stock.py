@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-14 18:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_alarm_core_alarm_created_6d4aca_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='holdings',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='holdings',
+            name='stock',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='holding', to='core.stock'),
+        ),
+    ]
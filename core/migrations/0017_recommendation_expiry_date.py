@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-14 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_alter_holdings_unique_together_alter_holdings_stock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendation',
+            name='expiry_date',
+            field=models.DateField(blank=True, db_index=True, help_text='Datum, bis zu dem die Empfehlung gilt', null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-14 18:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_recommendation_expiry_date'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='page',
+            options={},
+        ),
+    ]
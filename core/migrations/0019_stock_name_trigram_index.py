@@ -0,0 +1,35 @@
+# Trigram-Index für die Namenssuche im Stock-Admin (name__icontains).
+# Nur auf PostgreSQL: Ein B-Tree-Index kann '%Begriff%' nicht bedienen, pg_trgm schon.
+# Django übersetzt icontains dort in UPPER("name"::text) LIKE UPPER(...), daher der Ausdrucksindex.
+# Auf SQLite (Standard dieses Projekts) gibt es keinen passenden Index; die Migration ist dort leer.
+
+from django.db import migrations
+
+INDEX_NAME = "core_stock_name_upper_trgm"
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = schema_editor.quote_name(apps.get_model('core', 'Stock')._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} USING gin (UPPER("name"::text) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_alter_page_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -25,8 +25,5 @@ class Page(models.Model):
     url = models.URLField()
     icon = models.URLField(blank=True, null=True)
 
-    class Meta:
-        ordering = ['title'] # Standard-Sortierung nach Titel
-
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -3,6 +3,17 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 from django.utils import timezone
 
+class WithStockManager(models.Manager):
+    """
+    Lädt die verknüpfte Aktie per JOIN mit, für Stellen, die __str__ oder Name/Symbol der
+    Aktie anzeigen (sonst eine Abfrage pro Zeile). Als zusätzlicher Manager objects_with_stock,
+    der Standard-Manager objects bleibt ohne JOIN.
+    Achtung: only()/defer() müssen 'stock' dann mit enthalten.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('stock')
+
+
 class Stock(models.Model):
     """
     Grundsätzliche Informationen zu einer Aktie
@@ -24,7 +35,8 @@ class Stock(models.Model):
     symbol = models.CharField(
         max_length=10,
         help_text="Börsenkürzel (z.B. AAPL, SAP)",
-        null=True, blank=True
+        null=True, blank=True,
+        db_index=True,
     )
     name = models.CharField(
         max_length=200,
@@ -53,6 +65,9 @@ class Stock(models.Model):
         verbose_name = "Aktie"
         verbose_name_plural = "Aktien"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name']), # Für ORDER BY name; die Teilwortsuche (icontains) bedient auf PostgreSQL der Trigram-Index aus Migration 0019
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.symbol})"
@@ -62,19 +77,19 @@ class Holdings(models.Model):
     """
     Bestand an Aktien pro Benutzer
     """
-    CATEGORY_CHOICES = [
-        (1, 'Basis Investment'),
-        (2, 'Dividende'),
-        (3, 'D/EU'),
-        (4, 'US Tech'),
-        (5, 'World Tech'),
-        (6, 'Compounder'),
-        (99, 'Sonstiges'),
-    ]
-    stock = models.ForeignKey(
+    class Category(models.IntegerChoices):
+        BASIS_INVESTMENT = 1, 'Basis Investment'
+        DIVIDENDE = 2, 'Dividende'
+        D_EU = 3, 'D/EU'
+        US_TECH = 4, 'US Tech'
+        WORLD_TECH = 5, 'World Tech'
+        COMPOUNDER = 6, 'Compounder'
+        SONSTIGES = 99, 'Sonstiges'
+
+    stock = models.OneToOneField(
         Stock,
         on_delete=models.CASCADE,
-        related_name='holdings'
+        related_name='holding' # Höchstens ein Bestand je Aktie: stock.holding
     )
     quantity = models.DecimalField(
         max_digits=12,
@@ -91,8 +106,8 @@ class Holdings(models.Model):
         help_text="Durchschnittlicher Einkaufspreis"
     )
     category = models.IntegerField(
-        choices=CATEGORY_CHOICES,
-        default=CATEGORY_CHOICES[-1][0], # Standardmäßig 'Sonstiges' (99)
+        choices=Category.choices,
+        default=Category.SONSTIGES,
         null=True,
         blank=True,
         help_text="Vertrauensgrad der Empfehlung"
@@ -104,11 +119,16 @@ class Holdings(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    objects_with_stock = WithStockManager()
+
     class Meta:
         verbose_name = "Bestand"
         verbose_name_plural = "Bestände"
-        unique_together = ['stock']
         ordering = ['-quantity']
+        indexes = [
+            models.Index(fields=['-quantity']),
+        ]
 
     def __str__(self):
         return f"{self.stock.name}: {self.quantity} ({self.stock.symbol})"
@@ -138,14 +158,14 @@ class SavingPlan(models.Model):
         validators=[MinValueValidator(Decimal('0.01'))],
         help_text="Höhe des Sparplans"
     )
-    FREQUENCY_CHOICES = [
-        (1, 'Weekly'),
-        (2, 'Monthly'),
-        (3, 'Quarterly'),
-    ]
+    class Frequency(models.IntegerChoices):
+        WEEKLY = 1, 'Weekly'
+        MONTHLY = 2, 'Monthly'
+        QUARTERLY = 3, 'Quarterly'
+
     frequency = models.IntegerField(
-        choices=FREQUENCY_CHOICES,
-        default=FREQUENCY_CHOICES[1][0], # Standardmäßig 'Monthly' (2)
+        choices=Frequency.choices,
+        default=Frequency.MONTHLY,
         null=True,
         blank=True,
         help_text="Ausführungsintervall des Sparplans  "
@@ -164,6 +184,9 @@ class SavingPlan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    objects_with_stock = WithStockManager()
+
 class Alarm(models.Model):
     """
     Schwellwerte für Aktien mit Benachrichtigungen
@@ -203,10 +226,16 @@ class Alarm(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    objects_with_stock = WithStockManager()
+
     class Meta:
         verbose_name = "Alarm"
         verbose_name_plural = "Alarme"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.stock.symbol} {self.threshold_value_high} {self.threshold_value_low}"
@@ -216,33 +245,31 @@ class Recommendation(models.Model):
     """
     Empfehlungen zu Aktien von verschiedenen Quellen
     """
-    STRATEGY_CHOICES = [
-        (1, 'Safety First'),
-        (2, 'Dividende'),
-        (3, 'AI'),
-        (4, 'sonstige Tech'),
-        (5, 'Defense'),
-        (6, 'Turnaround Kandidat'),
-        (7, 'Burggraben'),
-        (99, 'Sonstiges'),
-    ]
-    ACTION_CHOICES = [
-        ('buy', 'Kaufen'),
-        ('sell', 'Verkaufen'),
-        ('hold', 'Halten'),
-        ('strong_buy', 'Stark Kaufen'),
-        ('strong_sell', 'Stark Verkaufen'),
-        ('watch', 'Beobachten'),
-        ('volatile', 'Volatil'),
-    ]
-
-    CONFIDENCE_CHOICES = [
-        (1, 'Sehr niedrig'),
-        (2, 'Niedrig'),
-        (3, 'Mittel'),
-        (4, 'Hoch'),
-        (5, 'Sehr hoch'),
-    ]
+    class Strategy(models.IntegerChoices):
+        SAFETY_FIRST = 1, 'Safety First'
+        DIVIDENDE = 2, 'Dividende'
+        AI = 3, 'AI'
+        SONSTIGE_TECH = 4, 'sonstige Tech'
+        DEFENSE = 5, 'Defense'
+        TURNAROUND = 6, 'Turnaround Kandidat'
+        BURGGRABEN = 7, 'Burggraben'
+        SONSTIGES = 99, 'Sonstiges'
+
+    class Action(models.TextChoices):
+        BUY = 'buy', 'Kaufen'
+        SELL = 'sell', 'Verkaufen'
+        HOLD = 'hold', 'Halten'
+        STRONG_BUY = 'strong_buy', 'Stark Kaufen'
+        STRONG_SELL = 'strong_sell', 'Stark Verkaufen'
+        WATCH = 'watch', 'Beobachten'
+        VOLATILE = 'volatile', 'Volatil'
+
+    class Confidence(models.IntegerChoices):
+        SEHR_NIEDRIG = 1, 'Sehr niedrig'
+        NIEDRIG = 2, 'Niedrig'
+        MITTEL = 3, 'Mittel'
+        HOCH = 4, 'Hoch'
+        SEHR_HOCH = 5, 'Sehr hoch'
 
     stock = models.ForeignKey(
         Stock,
@@ -251,8 +278,8 @@ class Recommendation(models.Model):
     )
     action = models.CharField(
         max_length=15,
-        choices=ACTION_CHOICES,
-        default='hold',
+        choices=Action.choices,
+        default=Action.HOLD,
         help_text="Empfohlene Aktion"
     )
     source = models.CharField(
@@ -268,15 +295,15 @@ class Recommendation(models.Model):
         help_text="Kursziel"
     )
     confidence = models.IntegerField(
-        choices=CONFIDENCE_CHOICES,
-        default=CONFIDENCE_CHOICES[2][0], # Standardmäßig 'Mittel' (3)
+        choices=Confidence.choices,
+        default=Confidence.MITTEL,
         null=True,
         blank=True,
         help_text="Vertrauensgrad der Empfehlung"
     )
     strategy = models.IntegerField(
-        choices=STRATEGY_CHOICES,
-        default=STRATEGY_CHOICES[-1][0], # Standardmäßig 'Sonstiges' (99)
+        choices=Strategy.choices,
+        default=Strategy.SONSTIGES,
         null=True,
         blank=True,
         help_text="Vertrauensgrad der Empfehlung"
@@ -298,24 +325,41 @@ class Recommendation(models.Model):
         default=True,
         help_text="Empfehlung ist noch gültig"
     )
+    expiry_date = models.DateField(
+        help_text="Datum, bis zu dem die Empfehlung gilt",
+        null=True, blank=True,
+        db_index=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    objects_with_stock = WithStockManager()
+
     class Meta:
         verbose_name = "Empfehlung"
         verbose_name_plural = "Empfehlungen"
         ordering = ['-publication_date']
+        indexes = [
+            models.Index(fields=['-publication_date']),
+            # Neueste gültige Empfehlung je Aktie
+            models.Index(fields=['stock', 'is_valid', '-publication_date']),
+        ]
 
     def __str__(self):
         return f"{self.stock.name}({self.stock.isin}): {self.get_action_display()} von {self.source}"
 
+    @property
+    def is_expired(self):
+        """Abgelaufen, wenn das Ablaufdatum vor dem heutigen Tag liegt (ohne Ablaufdatum nie)"""
+        return self.expiry_date is not None and self.expiry_date < timezone.localdate()
+
 class DecicionLog(models.Model):
     
-    ACTION_CHOICES = [
-        ('buy', 'Kaufen'),
-        ('sell', 'Verkaufen'),
-        ('hold', 'Halten'),
-         ]
+    class Action(models.TextChoices):
+        BUY = 'buy', 'Kaufen'
+        SELL = 'sell', 'Verkaufen'
+        HOLD = 'hold', 'Halten'
 
     stock = models.ForeignKey(
         Stock,
@@ -324,8 +368,8 @@ class DecicionLog(models.Model):
     )
     action = models.CharField(
         max_length=5,
-        choices=ACTION_CHOICES,
-        default='hold',
+        choices=Action.choices,
+        default=Action.HOLD,
         help_text="Empfohlene Aktion"
     )
     source = models.CharField(
@@ -367,6 +411,9 @@ class DecicionLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    objects_with_stock = WithStockManager()
+
     class Meta:
         verbose_name = "Entscheidungsprotokoll"
         verbose_name_plural = "Entscheidungen"
@@ -0,0 +1,33 @@
+# myproject/myapp/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .libs.cache_lib import bump_cache_version
+from .models import Category, Page, Stock, Holdings, Alarm, Recommendation, gmailShareConfig
+
+BOOKMARKS_CACHE = "bookmarks"
+PORTFOLIO_STATS_CACHE = "portfolio_stats"
+GMAIL_CONFIG_CACHE = "gmail_share_config"
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Page)
+def invalidate_bookmarks_cache(sender, **kwargs):
+    """Lesezeichen wurden geändert: gecachte Admin-Listen verwerfen."""
+    bump_cache_version(BOOKMARKS_CACHE)
+
+
+@receiver([post_save, post_delete], sender=Stock)
+@receiver([post_save, post_delete], sender=Holdings)
+@receiver([post_save, post_delete], sender=Alarm)
+@receiver([post_save, post_delete], sender=Recommendation)
+def invalidate_portfolio_stats_cache(sender, **kwargs):
+    """Depotdaten wurden geändert: gecachte Dashboard-Kennzahlen verwerfen."""
+    bump_cache_version(PORTFOLIO_STATS_CACHE)
+
+
+@receiver([post_save, post_delete], sender=gmailShareConfig)
+def invalidate_gmail_config_cache(sender, **kwargs):
+    """Gmail-Konfiguration wurde geändert: gecachte Formular-Vorgaben verwerfen."""
+    bump_cache_version(GMAIL_CONFIG_CACHE)
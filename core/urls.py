@@ -1,6 +1,6 @@
 # core/urls.py
 from django.urls import path
-from .views import openai_dashboard, ask_ai_view, ask_page, process_emails_view, process_channels_view, bookmark_list_view, HomeView
+from .views import openai_dashboard, openai_dashboard_refresh, ask_ai_view, ask_page, process_emails_view, process_channels_view, bookmark_list_view, HomeView
 from django.contrib import admin
 
 urlpatterns = [
@@ -9,6 +9,7 @@ urlpatterns = [
     path("api/ask/", ask_ai_view, name="ask_ai"),
     path("ask/", ask_page, name="ask-page"),
     path("dashboard/", openai_dashboard, name="openai-dashboard"),
+    path("dashboard/refresh/", openai_dashboard_refresh, name="openai-dashboard-refresh"),
     path('get_emails/', process_emails_view, name='process_emails'),
     path('get_channels/', process_channels_view, name='process_channels'),
     path('bookmarks/', bookmark_list_view, name='bookmarks_list'), # Neue URL für Bookmarks
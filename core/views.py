@@ -1,20 +1,51 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 from django.views.generic import TemplateView
+from django.db.models import Prefetch
 from django.conf import settings
 from core.llm.openai_llm import OpenAILLM # Annahme, dass dies vorhanden ist
 from core.libs.gmail_processor import run_email_automation
 from core.libs.teams_processor import run_channel_automation
-from django.shortcuts import render
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_POST
+import itertools
 import json
+import zlib
+from .forms import ChannelForm, EmailForm
 from .models import Category, Page, gmailShareConfig
 from .libs.portfolio_stats import get_stats
+from .libs.cache_lib import get_cache_version
+from .signals import GMAIL_CONFIG_CACHE
+from django.core.cache import cache
 import os
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# orjson (optional) parst die Request-Bodies von ask_ai_view schneller als json
+ORJSON_AVAILABLE = True
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    ORJSON_AVAILABLE = False
+
+# Menü-Daten für HomeView, URLs bereits absolut (mit führendem Slash)
+_MENU = [
+    {'name': "Dashboard", 'url': "/", 'icon': "fas fa-home"},
+    {'name': "Bookmarks", 'url': "/bookmarks/", 'icon': "fas fa-bookmark"},
+    {'name': "Ask AI", 'url': "/ask/", 'icon': "fas fa-robot"},
+    {'name': "Aktien E-Mails", 'url': "/get_emails/", 'icon': "fas fa-envelope"},
+]
+
+# Ab so vielen Kategorien wird die Lesezeichen-Seite gestreamt
+BOOKMARK_STREAM_THRESHOLD = 200
+BOOKMARK_STREAM_CHUNK_SIZE = 200
+
+GMAIL_CONFIG_CACHE_TIMEOUT = 300 # Sekunden; Änderungen invalidieren zusätzlich über die Signale
+
 class HomeView(TemplateView):
     """
     Homepage mit Übersicht und Navigation
@@ -31,92 +62,138 @@ class HomeView(TemplateView):
     
     def get_menu_items(self):
         """
-        Dynamisches Menü basierend auf Ihrer Liste
+        Dynamisches Menü basierend auf _MENU; nur der aktive Punkt hängt vom Request ab
         """
-        # Ihre Menü-Daten
-        menu = [
-            ("Dashboard", "/", "fas fa-home"),
-            ("Bookmarks", "bookmarks/", "fas fa-bookmark"), 
-            ("Ask AI", "ask/", "fas fa-robot"),
-            ("Aktien E-Mails", "get_emails/", "fas fa-envelope"),
-        ]
-        
-        # Menü-Items mit aktueller URL vergleichen
         current_path = self.request.path
-        menu_items = []
-        
-        for item in menu:
-            if len(item) == 3:
-                name, url, icon = item
-            else:
-                # Fallback falls nur Name und URL gegeben sind
-                name, url = item[:2]
-                icon = "fas fa-circle"
-            
-            # Vollständige URL erstellen (relativ zur App)
-            if not url.startswith('/'):
-                full_url = f"/{url}" if url != "/" else "/"
-            else:
-                full_url = url
-            
-            # Prüfen ob aktueller Menüpunkt aktiv ist
-            is_active = (current_path == full_url) or (url != "/" and current_path.startswith(f"/{url}"))
-            
-            menu_items.append({
-                'name': name,
-                'url': full_url,
-                'icon': icon,
-                'is_active': is_active
-            })
-        
-        return menu_items
+        return [
+            {**item, 'is_active': (current_path == item['url']) or (item['url'] != "/" and current_path.startswith(item['url']))}
+            for item in _MENU
+        ]
     
 
-def check_openai_llm():
-    if settings.OPENAI_LLM == None:
-            settings.OPENAI_LLM = OpenAILLM(api_key=settings.OPENAI_API_KEY)
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm():
+    """Liefert die prozessweit geteilte OpenAILLM-Instanz; wird beim ersten Aufruf genau einmal erstellt."""
+    global _llm
+    if _llm is not None:
+        return _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = OpenAILLM(api_key=settings.OPENAI_API_KEY)
+    return _llm
 
 # Create your views here.
 def openai_dashboard(request):
-    check_openai_llm()
-    balance = settings.OPENAI_LLM.get_account_balance()
-    return render(request, "dashboard.html", {"balance": balance})
+    # Der Kontostand wird in OpenAILLM für BALANCE_CACHE_TTL Sekunden zwischengespeichert
+    return render(request, "dashboard.html", {"balance": get_llm().get_account_balance()})
+
+@require_POST
+def openai_dashboard_refresh(request):
+    """Lädt den Kontostand sofort neu (am Cache vorbei) und zeigt wieder das Dashboard."""
+    get_llm().get_account_balance(force_refresh=True)
+    return redirect("openai-dashboard")
 
 def ask_page(request):
     logger.debug("Rendering ask page")
     return render(request, "ask.html")
 
+def _sse_events(chunks):
+    """
+    Verpackt Text-Stücke als Server-Sent Events. Fehler während des Streams können nicht mehr
+    als HTTP-Status gemeldet werden und kommen deshalb als eigenes Event.
+    """
+    try:
+        for chunk in chunks:
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+    except Exception as e:
+        logger.error("Error while streaming in ask_ai_view: %s", e)
+        yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    else:
+        yield f"data: {json.dumps({'done': True})}\n\n"
+
+class _BodyTooLarge(Exception):
+    """Der entpackte Request-Body überschreitet DATA_UPLOAD_MAX_MEMORY_SIZE."""
+
+
+def _read_json_body(request):
+    """
+    Liest den (optional gzip-komprimierten) JSON-Body von ask_ai_view.
+    Der entpackte Inhalt wird wie ein unkomprimierter Body auf DATA_UPLOAD_MAX_MEMORY_SIZE
+    begrenzt (Schutz vor gzip-Bomben). Wirft _BodyTooLarge oder ValueError bei ungültigen Daten.
+    """
+    raw_body = request.body
+    if request.headers.get("Content-Encoding", "").lower() == "gzip":
+        limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0 # None: keine Begrenzung
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            raw_body = decompressor.decompress(raw_body, limit)
+        except zlib.error as e:
+            raise ValueError(f"Ungültige gzip-Daten: {e}") from e
+        if decompressor.unconsumed_tail or (limit and len(raw_body) >= limit and not decompressor.eof):
+            raise _BodyTooLarge()
+        if not decompressor.eof:
+            raise ValueError("Unvollständige gzip-Daten.")
+    body = orjson.loads(raw_body) if ORJSON_AVAILABLE else json.loads(raw_body) # Decode-Fehler sind ValueErrors
+    if not isinstance(body, dict):
+        raise ValueError("Der Request-Body muss ein JSON-Objekt sein.")
+    return body
+
 @csrf_exempt
+@require_POST
 def ask_ai_view(request):
-    logger.debug(f"Received request to ask AI, Request: {request}")
-    logger.debug(f"Request method: {request.method}")
-    check_openai_llm()
-    if request.method == "POST":
-        try:
-            body = json.loads(request.body)
-            model = body.get("model", "gpt-4o")
-            temperature = float(body.get("temperature", 0.7))
-            system_content = body.get("content", "You are a helpful assistant.")
-            user_prompt = body.get("input", "")
+    """Beantwortet eine Frage per OpenAI; andere Methoden als POST lehnt require_POST mit 405 ab."""
+    logger.debug("Received request to ask AI, Request: %s", request)
+    try:
+        body = _read_json_body(request)
+        model = body.get("model", "gpt-4o")
+        # JSON-Zahlen kommen bereits als int/float an; nur Strings müssen umgewandelt werden
+        temperature = body.get("temperature", 0.7)
+        if isinstance(temperature, str):
+            temperature = float(temperature)
+    except _BodyTooLarge:
+        logger.warning("ask_ai_view: entpackter Request-Body zu groß")
+        return JsonResponse({"error": "Request body too large."}, status=413)
+    except ValueError as e:
+        logger.warning("ask_ai_view: ungültiger Request-Body: %s", e)
+        return JsonResponse({"error": f"Invalid request body: {e}"}, status=400)
 
-            logger.debug(f"Parameters: {model}, {temperature}, {system_content}, {user_prompt}")
+    try:
+        system_content = body.get("content", "You are a helpful assistant.")
+        user_prompt = body.get("input", "")
 
-            result = settings.OPENAI_LLM.query_ai(
-                prompt = user_prompt, temperature = temperature, content = system_content, model = model)
+        logger.debug("Parameters: %s, %s, %s, %s", model, temperature, system_content, user_prompt)
 
-            return JsonResponse({"result": result})
+        llm = get_llm()
+        # Mit "Accept: text/event-stream" wird die Antwort gestreamt, sobald OpenAI sie erzeugt
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            response = StreamingHttpResponse(
+                _sse_events(llm.stream_ai(
+                    prompt = user_prompt, temperature = temperature, content = system_content, model = model)),
+                content_type="text/event-stream")
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no" # Kein Puffern durch einen vorgeschalteten nginx
+            return response
 
-        except Exception as e:
-            logger.error(f"Error in ask_ai_view: {e}")
-            return JsonResponse({"error": str(e)}, status=500)
-    else:
-        logger.error("ask_ai_view received non-POST request")
-        return JsonResponse({"error": "Only POST method allowed."}, status=405)
+        result = llm.query_ai(
+            prompt = user_prompt, temperature = temperature, content = system_content, model = model)
+
+        return JsonResponse({"result": result})
+
+    except Exception as e:
+        logger.error("Error in ask_ai_view: %s", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+def _get_gmail_config():
+    """Die (praktisch statische) Gmail-Konfiguration, gecacht statt einer Abfrage pro Aufruf."""
+    key = f"{GMAIL_CONFIG_CACHE}:{get_cache_version(GMAIL_CONFIG_CACHE)}"
+    return cache.get_or_set(key, gmailShareConfig.objects.first, GMAIL_CONFIG_CACHE_TIMEOUT)
 
 @csrf_protect
 def process_emails_view(request):
-    config = gmailShareConfig.objects.first()
-    logging.debug(f"Using gmailShareConfig: {config}")
+    config = _get_gmail_config()
+    logger.debug("Using gmailShareConfig: %s", config)
     
     """
     Rendert das Formular zum Verarbeiten von E-Mails
@@ -133,30 +210,24 @@ def process_emails_view(request):
     }
 
     if request.method == 'POST':
-        # Parameter aus dem Formular holen
-        gmail_user = request.POST.get('gmail_user')
-        gmail_password = request.POST.get('gmail_password')
-        source_folder = request.POST.get('source_folder')
-        target_folder = request.POST.get('target_folder')
-        save_path = request.POST.get('save_path')
+        # Parameter aus dem Formular holen und in einem Durchlauf validieren
+        form = EmailForm(request.POST)
+        is_valid = form.is_valid()
 
         # Die eingegebenen Werte werden immer in den Kontext gesetzt, 
-        # damit sie im Formular wieder angezeigt werden (außer dem Passwort).
-        context['gmail_user'] = gmail_user
-        context['source_folder'] = source_folder
-        context['target_folder'] = target_folder
-        context['save_path'] = save_path
-        context['gmail_password'] = gmail_password
+        # damit sie im Formular wieder angezeigt werden.
+        context.update({name: form.cleaned_data.get(name, "") for name in form.fields})
 
         # Überprüfe, ob alle notwendigen Felder ausgefüllt sind
-        if not all([gmail_user, gmail_password, source_folder, target_folder, save_path]):
+        if not is_valid:
             context['message'] = "Bitte füllen Sie alle Felder aus."
             context['success'] = False
         else:
             try:
                 # Rufe das Python-Skript auf. Es gibt jetzt (True/False, Nachricht) zurück.
+                data = form.cleaned_data
                 success, message = run_email_automation(
-                    gmail_user, gmail_password, source_folder, target_folder, save_path
+                    data['gmail_user'], data['gmail_password'], data['source_folder'], data['target_folder'], data['save_path']
                 )
                 context['message'] = message
                 context['success'] = success
@@ -165,7 +236,7 @@ def process_emails_view(request):
                 # Dies fängt jede Exception ab, die von run_email_automation geworfen wird.
                 # run_email_automation selbst fängt GMAIL_LIB_EXCEPTIONs ab und gibt (False, message) zurück,
                 # aber für den Fall, dass ein unerwarteter Fehler durchschlägt, fangen wir ihn hier ab.
-                logger.error(f"Unerwarteter Fehler in process_emails_view: {e}", exc_info=True)
+                logger.error("Unerwarteter Fehler in process_emails_view: %s", e, exc_info=True)
                 context['message'] = f"Ein unerwarteter Fehler ist aufgetreten: {e}"
                 context['success'] = False
     
@@ -205,77 +276,72 @@ def process_channels_view(request):
     }
 
     if request.method == "POST":
-        # Parameter aus dem Formular holen
-        tenant_id = (request.POST.get("tenant_id") or "").strip()
-        client_id = (request.POST.get("client_id") or "").strip()
-        client_secret = (request.POST.get("client_secret") or None)
-        team = (request.POST.get("team") or "").strip()
-        channel = (request.POST.get("channel") or "").strip()
-        save_path = (request.POST.get("save_path") or "").strip()
-
-        # Checkbox: wenn nicht gesetzt, liefert POST kein Feld -> False
-        raw_flag = (request.POST.get("use_device_code") or "").lower()
-        use_device_code = raw_flag in ("1", "true", "on", "yes")
+        # Parameter aus dem Formular holen und in einem Durchlauf validieren
+        form = ChannelForm(request.POST)
+        is_valid = form.is_valid()
+        data = form.cleaned_data
 
         # Eingegebene Werte (ohne Secret) wieder in den Kontext
         context.update({
-            "tenant_id": tenant_id,
-            "client_id": client_id,
-            "team": team,
-            "channel": channel,
-            "save_path": save_path,
-            "use_device_code": use_device_code,
+            name: data.get(name, "")
+            for name in ("tenant_id", "client_id", "team", "channel", "save_path")
         })
+        context["use_device_code"] = data.get("use_device_code", False)
 
-        # Validierung
-        missing_base = [
-            name for name, val in (
-                ("tenant_id", tenant_id),
-                ("client_id", client_id),
-                ("team", team),
-                ("channel", channel),
-                ("save_path", save_path),
-            ) if not val
-        ]
-        if missing_base:
-            context["message"] = f"Bitte füllen Sie alle Pflichtfelder aus: {', '.join(missing_base)}."
-            context["success"] = False
-            return render(request, "get_channels.html", context)
-
-        if not use_device_code and not client_secret:
-            context["message"] = "Wenn Device Code deaktiviert ist, muss ein Client Secret angegeben werden."
-            context["success"] = False
-            return render(request, "get_channels.html", context)
-
-        # Ausführung
-        try:
-            logger.info("Starte run_channel_automation für Team '%s' / Channel '%s' (DeviceCode=%s)", team, channel, use_device_code)
-            success, message = run_channel_automation(
-                tenant_id=tenant_id,
-                client_id=client_id,
-                client_secret=client_secret,
-                team_name_or_id=team,
-                channel_name_or_id=channel,
-                save_path=save_path,
-                use_device_code=use_device_code,
-            )
-            context["message"] = message
-            context["success"] = success
-        except Exception as e:
-            logger.error("Unerwarteter Fehler in process_channels_view: %s", e, exc_info=True)
-            context["message"] = f"Ein unerwarteter Fehler ist aufgetreten: {e}"
-            context["success"] = False
+        # Validierung; fehlende Pflichtfelder haben Vorrang vor der Secret-Prüfung
+        missing = form.missing_fields() if not is_valid else None
+        if missing:
+            context["message"] = f"Bitte füllen Sie alle Pflichtfelder aus: {', '.join(missing)}."
+        elif not is_valid:
+            context["message"] = form.first_error()
+        else:
+            # Ausführung
+            try:
+                logger.info("Starte run_channel_automation für Team '%s' / Channel '%s' (DeviceCode=%s)", data["team"], data["channel"], data["use_device_code"])
+                success, message = run_channel_automation(
+                    tenant_id=data["tenant_id"],
+                    client_id=data["client_id"],
+                    client_secret=data["client_secret"],
+                    team_name_or_id=data["team"],
+                    channel_name_or_id=data["channel"],
+                    save_path=data["save_path"],
+                    use_device_code=data["use_device_code"],
+                )
+                context["message"] = message
+                context["success"] = success
+            except Exception as e:
+                logger.error("Unerwarteter Fehler in process_channels_view: %s", e, exc_info=True)
+                context["message"] = f"Ein unerwarteter Fehler ist aufgetreten: {e}"
+                context["success"] = False
 
     return render(request, "get_channels.html", context)
 
 def bookmark_list_view(request):
     """
     Zeigt alle Lesezeichen an, gruppiert nach Kategorien und sortiert nach Priorität.
+    Ab BOOKMARK_STREAM_THRESHOLD Kategorien wird die Seite gestreamt, statt alle Kategorien
+    samt Seiten gleichzeitig im Speicher zu halten.
     """
-    # Rufe alle Kategorien ab und lade die zugehörigen Seiten effizient
-    categories = Category.objects.order_by('priority').prefetch_related('pages').all()
-    
+    # Rufe alle Kategorien ab und lade die zugehörigen Seiten blockweise mit einer bereits
+    # sortierten IN-Abfrage (bei kleinen Listen 2 Queries insgesamt, ohne zusätzliches COUNT)
+    # Die Seiten werden vollständig angezeigt (inkl. Beschreibung), von der Kategorie nur der Name
+    categories = Category.objects.only('id', 'name').order_by('priority').prefetch_related(
+        Prefetch('pages', queryset=Page.objects.order_by('title'))
+    ).iterator(chunk_size=BOOKMARK_STREAM_CHUNK_SIZE)
+
+    # Erst so viele Kategorien lesen, wie für die Entscheidung nötig sind
+    first = list(itertools.islice(categories, BOOKMARK_STREAM_THRESHOLD + 1))
+    if len(first) > BOOKMARK_STREAM_THRESHOLD:
+        return StreamingHttpResponse(_stream_bookmarks(itertools.chain(first, categories)))
+
     context = {
-        'categories': categories
+        'categories': first
     }
     return render(request, 'bookmarks_list.html', context)
+
+def _stream_bookmarks(categories):
+    """Rendert die Seite stückweise aus einem Iterator, der Kategorien (und ihre Seiten) blockweise lädt."""
+    yield render_to_string('_bookmarks_head.html')
+    for category in categories:
+        yield render_to_string('_category_block.html', {'category': category})
+    yield render_to_string('_bookmarks_foot.html')